@@ -1,14 +1,32 @@
 #!/usr/bin/env python3
 """Main entry point for the Video Agent MCP server."""
 
+import os
 import sys
+import queue
+import atexit
+import logging
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
 from dotenv import load_dotenv
 
+def configure_logging():
+    """Route log records through a queue so stderr writes happen off the event loop."""
+    log_queue = queue.SimpleQueue()
+    stream_handler = logging.StreamHandler(sys.stderr)  # stdout carries the MCP protocol
+    stream_handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+    listener = QueueListener(log_queue, stream_handler)
+    queue_handler = QueueHandler(log_queue)
+    queue_handler.setFormatter(logging.Formatter("%(message)s"))  # Final formatting happens in the listener
+    logging.basicConfig(level=os.getenv("LOG_LEVEL", "INFO").upper(), handlers=[queue_handler])
+    listener.start()
+    atexit.register(listener.stop)
+
 def main():
     """Main entry point for the Video Agent MCP server."""
     # Load environment variables from .env file
     load_dotenv()
+    configure_logging()
 
     # Add src to Python path
     sys.path.insert(0, str(Path(__file__).parent / "src"))
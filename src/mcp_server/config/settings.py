@@ -19,6 +19,8 @@ class Settings:
         # API configuration
         self.fal_api_key = os.getenv("FALAI_API_KEY", "")
         self.youtube_api_key = os.getenv("YOUTUBE_API_KEY") or os.getenv("GOOGLE_API_KEY", "")
+        self.youtube_category_ttl = int(os.getenv("YT_CATEGORY_TTL", "86400"))  # seconds categories stay cached on disk
+        self.youtube_max_qps = float(os.getenv("YT_MAX_QPS", "5"))  # Data API requests started per second
         
         # Storage paths
         self.base_dir = Path(__file__).parent.parent.parent.parent
@@ -28,6 +30,8 @@ class Settings:
         self.templates_dir = self.base_dir / "templates"
         self.assets_dir = self.storage_dir / "assets"
         self.logos_dir = self.assets_dir / "logos"
+        self.artifacts_dir = self.storage_dir / "artifacts"
+        self.cache_dir = self.storage_dir / "cache"
         
         # Ensure directories exist
         self.storage_dir.mkdir(parents=True, exist_ok=True)
@@ -35,11 +39,17 @@ class Settings:
         self.projects_dir.mkdir(parents=True, exist_ok=True)
         self.assets_dir.mkdir(parents=True, exist_ok=True)
         self.logos_dir.mkdir(parents=True, exist_ok=True)
+        self.artifacts_dir.mkdir(parents=True, exist_ok=True)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
         
         # API limits and defaults
         self.max_parallel_downloads = int(os.getenv("MAX_PARALLEL_DOWNLOADS", "5"))
         self.download_timeout = int(os.getenv("DOWNLOAD_TIMEOUT", "300"))  # seconds
+        # Bounds for the cache of downloaded video results; oldest files are evicted first
+        self.artifact_cache_max_mb = int(os.getenv("ARTIFACT_CACHE_MAX_MB", "5120"))
+        self.artifact_max_age_hours = int(os.getenv("ARTIFACT_MAX_AGE_HOURS", "72"))
         self.generation_timeout = int(os.getenv("GENERATION_TIMEOUT", "600"))  # seconds
+        self.fal_concurrency = int(os.getenv("FAL_CONCURRENCY", "16"))  # queued tasks submitted to FAL at once
         
         # Default generation parameters
         self.default_image_model = os.getenv("DEFAULT_IMAGE_MODEL", "imagen4")
@@ -49,7 +59,13 @@ class Settings:
         
         # Video assembly settings
         self.ffmpeg_path = self._get_ffmpeg_path()
+        # Concurrent ffmpeg processes; each gets an equal share of the CPUs via -threads
+        self.ffmpeg_max_concurrency = max(1, int(os.getenv("FFMPEG_MAX_CONCURRENCY", str(max(1, (os.cpu_count() or 4) // 2)))))
         self.default_video_codec = os.getenv("DEFAULT_VIDEO_CODEC", "libx264")
+        # Hardware H.264 encoder for re-encodes: "auto" picks the first one that works, "none" forces libx264
+        self.ffmpeg_hw_encoder = os.getenv("FFMPEG_HW_ENCODER", "auto")
+        # Join stream-compatible clips and mix the project audio in one ffmpeg run
+        self.fused_assembly = os.getenv("FUSED_ASSEMBLY", "true").lower() == "true"
         self.default_audio_codec = os.getenv("DEFAULT_AUDIO_CODEC", "aac")
         self.default_output_format = os.getenv("DEFAULT_OUTPUT_FORMAT", "mp4")
         
@@ -66,6 +82,9 @@ class Settings:
         self.enable_cost_tracking = os.getenv("ENABLE_COST_TRACKING", "true").lower() == "true"
         self.cost_warning_threshold = float(os.getenv("COST_WARNING_THRESHOLD", "10.0"))  # USD
         
+        # Debugging
+        self.debug = os.getenv("VIDEO_AGENT_DEBUG", "false").lower() == "true"
+        
     def validate(self) -> bool:
         """Validate required settings."""
         if not self.fal_api_key:
@@ -26,32 +26,42 @@ IMAGE_MODELS = {
     "imagen4": {
         "cost_per_image": 0.06,
         "fal_model_id": "fal-ai/imagen4/preview/ultra",
-        "supports_aspect_ratios": True
+        "supports_aspect_ratios": True,
+        "max_images_per_request": 4,
+        "cache_requires": ["seed"]  # Deterministic only with a pinned seed
     },
     "flux_pro": {
         "cost_per_image": 0.04,
         "fal_model_id": "fal-ai/flux-pro",
-        "supports_aspect_ratios": True
+        "supports_aspect_ratios": True,
+        "max_images_per_request": 4,
+        "cache_requires": ["seed"]
     },
     "flux_kontext": {
         "cost_per_image": 0.04,
         "fal_model_id": "fal-ai/flux-pro/kontext",
         "fixed_guidance_scale": 3.5,
-        "default_safety_tolerance": "3"
+        "default_safety_tolerance": "3",
+        "cache_requires": ["seed"]
     }
 }
 
+# Models without "cache_requires" (e.g. video) produce fresh output on every call
+# and must never be served from a result cache.
+
 # Audio model configurations
 AUDIO_MODELS = {
     "lyria2": {
         "cost_per_generation": 0.10,
         "fal_model_id": "fal-ai/lyria2",
-        "typical_duration": 95  # seconds
+        "typical_duration": 95,  # seconds
+        "cache_requires": ["seed"]
     },
     "minimax_speech": {
         "cost_per_1000_chars": 0.10,
         "fal_model_id": "fal-ai/minimax/speech-02-hd",
-        "supports_voices": True
+        "supports_voices": True,
+        "cache_requires": ["seed"]
     }
 }
 
@@ -150,4 +160,14 @@ SUPPORTED_EXTENSIONS = {
     "image": [".jpg", ".jpeg", ".png", ".gif", ".webp", ".bmp"],
     "video": [".mp4", ".mov", ".avi", ".webm", ".mkv"],
     "audio": [".mp3", ".wav", ".m4a", ".aac", ".ogg"]
-}
\ No newline at end of file
+}
+# FAL storage upload configuration
+UPLOAD_CONFIG = {
+    "rest_url": "https://rest.alpha.fal.ai",
+    "storage_type": "fal-cdn-v3",
+    "chunk_size": 8 * 1024 * 1024,  # 8 MB per multipart part
+    "stream_chunk_size": 1024 * 1024,  # 1 MB reads when streaming a single-part upload
+    "stream_threshold": 10 * 1024 * 1024,  # Files above this are streamed instead of read whole
+    "multipart_threshold": 90 * 1024 * 1024,  # Files above this are streamed in parts
+    "part_max_retries": 3
+}
@@ -69,12 +69,16 @@ class QueuedTask(BaseModel):
         }
 
 
+TERMINAL_STATUSES = frozenset({QueueStatus.COMPLETED, QueueStatus.FAILED, QueueStatus.CANCELLED})
+
+
 class QueueManager:
     """Manages all queued tasks."""
     
     def __init__(self):
         self._tasks: Dict[str, QueuedTask] = {}
         self._active_tasks: Dict[str, asyncio.Task] = {}
+        self._task_events: Dict[str, asyncio.Event] = {}  # Set once a task reaches a terminal status
         self._task_lock = asyncio.Lock()
     
     async def create_task(
@@ -97,6 +101,7 @@ class QueueManager:
         
         async with self._task_lock:
             self._tasks[task.id] = task
+            self._task_events[task.id] = asyncio.Event()
         
         return task
     
@@ -108,12 +113,18 @@ class QueueManager:
                 for key, value in updates.items():
                     if hasattr(task, key):
                         setattr(task, key, value)
+                if task.status in TERMINAL_STATUSES:
+                    self._task_events[task_id].set()
             return task
     
     async def get_task(self, task_id: str) -> Optional[QueuedTask]:
         """Get a task by ID."""
         return self._tasks.get(task_id)
     
+    def get_event(self, task_id: str) -> Optional[asyncio.Event]:
+        """Get the event that is set when a task completes, fails or is cancelled."""
+        return self._task_events.get(task_id)
+    
     async def get_all_tasks(
         self,
         project_id: Optional[str] = None,
@@ -149,6 +160,7 @@ class QueueManager:
             task.status = QueueStatus.CANCELLED
             task.completed_at = datetime.now()
             task.error_message = "Task cancelled by user"
+            self._task_events[task_id].set()
             
             return True
     
@@ -224,6 +236,7 @@ class QueueManager:
             
             for task_id in to_remove:
                 del self._tasks[task_id]
+                self._task_events.pop(task_id, None)
         
         return len(to_remove)
 
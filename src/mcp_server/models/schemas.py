@@ -51,6 +51,7 @@ class Asset(BaseModel):
     local_path: Optional[str] = None
     metadata: Dict[str, Any] = Field(default_factory=dict)
     generation_params: Optional[Dict[str, Any]] = None
+    probe: Optional[Dict[str, Any]] = None  # get_video_info() of local_path, taken when it was downloaded
     cost: float = 0.0
     created_at: datetime = Field(default_factory=datetime.now)
     
@@ -106,6 +107,15 @@ class VideoProject(BaseModel):
         # Cost from global audio tracks
         cost += sum(track.cost for track in self.global_audio_tracks)
         return round(cost, 3)
+    
+    def add_asset_cost(self, cost: float):
+        """Add a newly attached asset's cost to the running total."""
+        self.total_cost = round(self.total_cost + cost, 3)
+    
+    def set_scene_duration(self, scene: Scene, duration: int):
+        """Change a scene's duration and adjust the running total to match."""
+        self.actual_duration += duration - scene.duration
+        scene.duration = duration
 
 
 class GenerationTask(BaseModel):
@@ -1,9 +1,11 @@
 """Main MCP server implementation for Video Agent using FastMCP 2.0."""
 
 import json
+from contextlib import asynccontextmanager
 from fastmcp import FastMCP
 from typing import List, Optional, Dict, Any, Union
 from .config import settings
+from .services import fal_service
 
 # Import all tool implementations with aliases to avoid conflicts
 from .tools.project import (
@@ -59,10 +61,20 @@ from .prompts import (
     list_video_agent_capabilities
 )
 
+@asynccontextmanager
+async def lifespan(server: FastMCP):
+    """Flush caches and close HTTP clients when the server shuts down."""
+    try:
+        yield
+    finally:
+        await fal_service.cleanup()
+
+
 # Create the FastMCP server instance
 mcp = FastMCP(
     name=settings.server_name,
-    version=settings.version
+    version=settings.version,
+    lifespan=lifespan
 )
 
 # ============================================================================
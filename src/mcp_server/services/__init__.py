@@ -2,6 +2,6 @@
 
 from .fal_client import fal_service
 from .asset_storage import asset_storage
-from .ffmpeg_wrapper import ffmpeg_wrapper
+from .ffmpeg_wrapper import get_ffmpeg_wrapper, get_ffmpeg_wrapper_async
 
-__all__ = ["fal_service", "asset_storage", "ffmpeg_wrapper"]
\ No newline at end of file
+__all__ = ["fal_service", "asset_storage", "get_ffmpeg_wrapper", "get_ffmpeg_wrapper_async"]
\ No newline at end of file
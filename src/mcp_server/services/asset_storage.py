@@ -1,22 +1,41 @@
 """Asset storage and management service."""
 
 import os
+import shutil
 import asyncio
+import hashlib
 import aiofiles
 import httpx
 from pathlib import Path
 from typing import Optional, List, Dict, Any
 from datetime import datetime
 import json
+import time
 from ..config import settings
 
 
+# File extension used for each asset type
+ASSET_EXTENSIONS = {
+    "image": "png",
+    "video": "mp4",
+    "audio": "mp3",
+    "music": "mp3",
+    "speech": "mp3"
+}
+
+# Asset types kept in the artifact cache; only video result URLs expire before they are used
+ARTIFACT_TYPES = frozenset({"video"})
+
+
 class AssetStorage:
     """Manages local storage of generated and uploaded assets."""
     
     def __init__(self):
         self.storage_dir = settings.storage_dir
         self.temp_dir = settings.temp_dir
+        self.artifacts_dir = settings.artifacts_dir
+        # url -> running download, so a prefetch and a later download_asset share one fetch
+        self._pending_artifacts: Dict[str, asyncio.Future] = {}
         
     def get_asset_path(self, project_id: str, asset_id: str, extension: str) -> Path:
         """Get the local path for an asset."""
@@ -25,6 +44,107 @@ class AssetStorage:
         assets_dir.mkdir(exist_ok=True)
         return assets_dir / f"{asset_id}.{extension}"
     
+    def get_artifact_path(self, url: str, extension: str) -> Path:
+        """Get the content-addressed cache path for a remote artifact URL."""
+        url_hash = hashlib.sha256(url.encode()).hexdigest()
+        return self.artifacts_dir / f"{url_hash}.{extension}"
+    
+    async def cache_artifact(self, url: str, asset_type: str) -> Dict[str, Any]:
+        """Download a generated artifact once and keep it on disk.
+        
+        FAL result URLs are signed and expire, so the first download is kept
+        and every later request for the same URL is served from disk. The
+        cache is bounded by settings.artifact_cache_max_mb and
+        settings.artifact_max_age_hours.
+        """
+        try:
+            artifact_path = self.get_artifact_path(url, ASSET_EXTENSIONS.get(asset_type, "bin"))
+            if artifact_path.exists():
+                os.utime(artifact_path)  # Mark as recently used for eviction
+                return {
+                    "success": True,
+                    "local_path": str(artifact_path),
+                    "cached": True
+                }
+            
+            await asyncio.shield(self._fetch_artifact(url, artifact_path))
+            
+            return {
+                "success": True,
+                "local_path": str(artifact_path),
+                "cached": False
+            }
+            
+        except Exception as e:
+            return {
+                "success": False,
+                "error": str(e),
+                "url": url
+            }
+    
+    def prefetch_artifact(self, url: str, asset_type: str):
+        """Start caching an artifact in the background; failures are left to download_asset."""
+        artifact_path = self.get_artifact_path(url, ASSET_EXTENSIONS.get(asset_type, "bin"))
+        if not artifact_path.exists():
+            self._fetch_artifact(url, artifact_path)
+    
+    def _fetch_artifact(self, url: str, artifact_path: Path) -> asyncio.Future:
+        """Download url into the cache, joining a download of it that is already running."""
+        pending = self._pending_artifacts.get(url)
+        if pending is None:
+            pending = asyncio.ensure_future(self._download_artifact(url, artifact_path))
+            self._pending_artifacts[url] = pending
+            
+            def _done(f: asyncio.Future):
+                self._pending_artifacts.pop(url, None)
+                # Mark a failure retrieved, since a prefetch has no awaiter
+                f.cancelled() or f.exception()
+            
+            pending.add_done_callback(_done)
+        return pending
+    
+    async def _download_artifact(self, url: str, artifact_path: Path):
+        """Stream url into the cache, then evict whatever the new file pushes over the limits."""
+        await self._stream_to_file(url, artifact_path)
+        await asyncio.to_thread(self._evict_artifacts, artifact_path)
+    
+    @staticmethod
+    async def _stream_to_file(url: str, path: Path):
+        """Stream url to path through a temp file, so a partial download never looks complete."""
+        tmp_path = path.with_suffix(f".{os.getpid()}.part")
+        async with httpx.AsyncClient() as client:
+            async with client.stream("GET", url, timeout=settings.download_timeout) as response:
+                response.raise_for_status()
+                async with aiofiles.open(tmp_path, 'wb') as f:
+                    async for chunk in response.aiter_bytes(1024 * 1024):
+                        await f.write(chunk)
+        os.replace(tmp_path, path)
+    
+    def _evict_artifacts(self, keep: Path):
+        """Drop artifacts past the age limit, then least recently used ones until under the size limit.
+        
+        Project copies are hard links, so evicting an artifact never removes a
+        project's asset; it only stops the cache from keeping the data alive.
+        keep (the file just downloaded) and downloads still in progress stay.
+        """
+        entries = []
+        for path in self.artifacts_dir.iterdir():
+            try:
+                entries.append((path.stat(), path))
+            except FileNotFoundError:
+                continue
+        entries.sort(key=lambda entry: entry[0].st_mtime)
+        
+        cutoff = time.time() - settings.artifact_max_age_hours * 3600
+        max_bytes = settings.artifact_cache_max_mb * 1024 * 1024
+        total = sum(file_stat.st_size for file_stat, _ in entries)
+        for file_stat, path in entries:
+            expired = file_stat.st_mtime < cutoff
+            if path == keep or (not expired and (total <= max_bytes or path.suffix == ".part")):
+                continue
+            path.unlink(missing_ok=True)
+            total -= file_stat.st_size
+    
     async def download_asset(
         self,
         url: str,
@@ -35,26 +155,26 @@ class AssetStorage:
         """Download an asset from URL and store locally."""
         try:
             # Determine file extension based on asset type
-            ext_map = {
-                "image": "png",
-                "video": "mp4",
-                "audio": "mp3",
-                "music": "mp3",
-                "speech": "mp3"
-            }
-            extension = ext_map.get(asset_type, "bin")
+            extension = ASSET_EXTENSIONS.get(asset_type, "bin")
             
             # Get local path
             local_path = self.get_asset_path(project_id, asset_id, extension)
             
-            # Download the file
-            async with httpx.AsyncClient() as client:
-                response = await client.get(url, timeout=settings.download_timeout)
-                response.raise_for_status()
+            if asset_type in ARTIFACT_TYPES:
+                # Fetch through the artifact cache so the same URL is only downloaded once
+                artifact = await self.cache_artifact(url, asset_type)
+                if not artifact["success"]:
+                    return artifact
                 
-                # Save to local storage
-                async with aiofiles.open(local_path, 'wb') as f:
-                    await f.write(response.content)
+                # Hard-link the cached artifact into the project, copying across filesystems
+                try:
+                    if local_path.exists():
+                        local_path.unlink()
+                    os.link(artifact["local_path"], local_path)
+                except OSError:
+                    await asyncio.to_thread(shutil.copyfile, artifact["local_path"], local_path)
+            else:
+                await self._stream_to_file(url, local_path)
             
             # Save metadata
             metadata_path = local_path.with_suffix('.json')
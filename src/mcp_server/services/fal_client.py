@@ -2,14 +2,63 @@
 
 import os
 import asyncio
+import logging
 import httpx
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Callable
 from datetime import datetime
 import time
+import random
+import statistics
+from collections import defaultdict, deque
+import mimetypes
+import aiofiles
 import fal_client
 from pathlib import Path
+from types import MappingProxyType
 from ..config import settings
+from ..constants import UPLOAD_CONFIG, RETRY_CONFIG, IMAGE_MODELS, AUDIO_MODELS, VIDEO_MODELS
+from ..models import queue_manager, QueueStatus, ProjectManager, Asset, AssetType, AssetSource
 from .file_upload_cache import FileUploadCache
+from .result_cache import ResultCache
+from .job_registry import JobRegistry
+from .asset_storage import asset_storage
+from .ffmpeg_wrapper import get_ffmpeg_wrapper_async
+
+logger = logging.getLogger(__name__)
+
+# Static per-model argument templates, merged into each request instead of rebuilt per call
+_TEXT_TO_IMAGE_DEFAULTS = MappingProxyType({"num_images": 1})
+_FLUX_KONTEXT_DEFAULTS = MappingProxyType({"guidance_scale": 3.5})  # Always use 3.5 for optimal results
+_HAILUO_EXCLUDED_KWARGS = frozenset({"motion_strength", "prompt_optimizer"})
+
+# Result fields worth returning as metadata; the rest (logs, previews, diagnostics) is dropped
+_METADATA_KEEP = frozenset({"seed", "timings", "has_nsfw_concepts", "prompt", "aspect_ratio", "images"})
+
+# Arguments that must be pinned for a model's output to be deterministic, by FAL model ID.
+# Models missing here (generative calls with fresh randomness) are never cacheable.
+_CACHE_REQUIRES = MappingProxyType({
+    config["fal_model_id"]: tuple(config["cache_requires"])
+    for models in (IMAGE_MODELS, AUDIO_MODELS, VIDEO_MODELS)
+    for config in models.values()
+    if "cache_requires" in config
+})
+
+
+def _default_video_url(result: Dict[str, Any]) -> Optional[str]:
+    """Fallback for result shapes not registered below."""
+    return (result.get("video") or {}).get("url") or result.get("url") or result.get("output_url")
+
+
+def _nested_video_url(result: Dict[str, Any]) -> Optional[str]:
+    """Kling and Hailuo both return {"video": {"url": ...}}."""
+    video = result.get("video")
+    return video.get("url") if video else _default_video_url(result)
+
+
+# Video URL extractors by FAL model ID; models with a known result shape skip the fallback chain
+_URL_EXTRACTORS: Dict[str, Callable[[Dict[str, Any]], Optional[str]]] = {
+    config["fal_model_id"]: _nested_video_url for config in VIDEO_MODELS.values()
+}
 
 
 class FALClient:
@@ -29,11 +78,38 @@ class FALClient:
         # File upload cache
         self._upload_cache = FileUploadCache(max_size=100, ttl_hours=24)
         
+        # Result cache for deterministic (seeded) generations
+        self._result_cache = ResultCache(max_size=256, ttl_hours=24)
+        
+        # Warm both caches from the previous run; written back periodically and on cleanup
+        self._upload_cache_path = settings.cache_dir / "uploads.json"
+        self._result_cache_path = settings.cache_dir / "results.json"
+        self._upload_cache.load_from_disk(self._upload_cache_path)
+        self._result_cache.load_from_disk(self._result_cache_path)
+        self._persist_task: Optional[asyncio.Task] = None
+        self.cache_persist_interval = 60  # seconds
+        
+        # Persistent registry of submitted jobs, resumed on first use after a restart
+        self._jobs = JobRegistry(settings.storage_dir / "fal_jobs.json")
+        self._resume_task: Optional[asyncio.Task] = None
+        
+        # Identical deterministic calls already in flight, shared so a burst makes one upstream request
+        self._inflight: Dict[str, asyncio.Future] = {}
+        
+        # Recent completion times per model, used to time the first poll of a reattached job
+        self._durations: Dict[str, deque] = defaultdict(lambda: deque(maxlen=32))
+        self.poll_interval = 10  # seconds, first poll when a model has no history
+        self.max_poll_interval = 20  # seconds
+        
         # Retry configuration
         self.max_retries = 3
         self.retry_delay = 2  # seconds
+        self.max_retry_delay = RETRY_CONFIG["max_delay"]  # seconds, cap for backoff
         self.timeout = settings.generation_timeout
         
+        # Limit on queued tasks talking to FAL at once; the rest wait in QUEUED
+        self._submit_sem = asyncio.Semaphore(settings.fal_concurrency)
+        
     async def generate_image_from_text(
         self,
         prompt: str,
@@ -56,7 +132,7 @@ class FALClient:
                 "model": model,
                 "prompt": prompt,
                 "aspect_ratio": aspect_ratio,
-                "metadata": result
+                "metadata": self._slim_metadata(result)
             }
         except Exception as e:
             return {
@@ -65,6 +141,60 @@ class FALClient:
                 "model": model
             }
     
+    async def generate_images_batch(
+        self,
+        prompts: List[str],
+        model: str = "imagen4",
+        aspect_ratio: str = "16:9",
+        max_concurrent: int = 4,
+        **kwargs
+    ) -> List[Dict[str, Any]]:
+        """Generate one image per prompt, sharing requests where prompts repeat.
+        
+        Identical prompts are grouped into a single request using num_images;
+        distinct prompts run concurrently, at most max_concurrent at a time.
+        Results are returned in the same order as prompts.
+        """
+        max_per_request = IMAGE_MODELS.get(model, {}).get("max_images_per_request", 1)
+        
+        # Group indices of identical prompts, split to the model's num_images limit
+        grouped: Dict[str, List[int]] = {}
+        for index, prompt in enumerate(prompts):
+            grouped.setdefault(prompt, []).append(index)
+        batches = [
+            (prompt, indices[i:i + max_per_request])
+            for prompt, indices in grouped.items()
+            for i in range(0, len(indices), max_per_request)
+        ]
+        
+        semaphore = asyncio.Semaphore(max_concurrent)
+        
+        async def _run_batch(prompt: str, indices: List[int]) -> Dict[str, Any]:
+            async with semaphore:
+                return await self.generate_image_from_text(
+                    prompt, model, aspect_ratio, num_images=len(indices), **kwargs
+                )
+        
+        batch_results = await asyncio.gather(*[_run_batch(p, idx) for p, idx in batches])
+        
+        # Fan each batch's images back out to the prompts that requested them
+        results: List[Dict[str, Any]] = [{}] * len(prompts)
+        for (prompt, indices), result in zip(batches, batch_results):
+            images = result.get("metadata", {}).get("images", []) if result["success"] else []
+            for n, index in enumerate(indices):
+                if n < len(images):
+                    results[index] = {**result, "url": images[n].get("url")}
+                elif result["success"]:
+                    results[index] = {
+                        "success": False,
+                        "error": f"Model returned {len(images)} images for {len(indices)} requested",
+                        "model": model
+                    }
+                else:
+                    results[index] = result
+        
+        return results
+    
     async def generate_image_from_image(
         self,
         image_url: str,
@@ -84,7 +214,7 @@ class FALClient:
                 "model": model,
                 "source_image": image_url,
                 "prompt": prompt,
-                "metadata": result
+                "metadata": self._slim_metadata(result)
             }
         except Exception as e:
             return {
@@ -115,16 +245,16 @@ class FALClient:
             else:
                 raise ValueError(f"Unsupported video model: {model}")
             
-            # Handle different result formats from different models
-            video_url = None
-            if isinstance(result, dict):
-                # Try different possible formats
-                video_url = result.get("video", {}).get("url") or result.get("url") or result.get("output_url")
+            video_url = self.extract_video_url(VIDEO_MODELS[model]["fal_model_id"], result)
             
             if not video_url:
-                print(f"WARNING: Could not find video URL in result: {result}")
+                logger.warning("Could not find video URL in result: %s", result)
                 raise ValueError(f"No video URL found in result")
             
+            # Start keeping a local copy before the signed URL expires, without waiting for it;
+            # download_asset joins this download or reads the cached file
+            asset_storage.prefetch_artifact(video_url, "video")
+            
             return {
                 "success": True,
                 "url": video_url,
@@ -132,7 +262,7 @@ class FALClient:
                 "duration": duration,
                 "source_image": image_url,
                 "motion_prompt": motion_prompt,
-                "metadata": result
+                "metadata": self._slim_metadata(result)
             }
         except Exception as e:
             return {
@@ -157,7 +287,7 @@ class FALClient:
                 "model": "lyria2",
                 "prompt": prompt,
                 "duration": duration,
-                "metadata": result
+                "metadata": self._slim_metadata(result)
             }
         except Exception as e:
             return {
@@ -185,7 +315,7 @@ class FALClient:
                 "model": "minimax_speech",
                 "text": text,
                 "voice": voice,
-                "metadata": result
+                "metadata": self._slim_metadata(result)
             }
         except Exception as e:
             return {
@@ -198,53 +328,46 @@ class FALClient:
     
     async def _run_imagen4(self, prompt: str, aspect_ratio: str, **kwargs) -> Dict[str, Any]:
         """Run Google Imagen 4 model with retry logic."""
+        arguments = {**_TEXT_TO_IMAGE_DEFAULTS, "prompt": prompt, "aspect_ratio": aspect_ratio}
+        if kwargs:
+            arguments.update(kwargs)
         return await self._run_with_retry(
             model_id="fal-ai/imagen4/preview/ultra",
-            arguments={
-                "prompt": prompt,
-                "aspect_ratio": aspect_ratio,
-                "num_images": 1,
-                **kwargs
-            }
+            arguments=arguments
         )
     
     async def _run_flux_pro(self, prompt: str, aspect_ratio: str, **kwargs) -> Dict[str, Any]:
         """Run FLUX Pro model with retry logic."""
+        arguments = {**_TEXT_TO_IMAGE_DEFAULTS, "prompt": prompt, "aspect_ratio": aspect_ratio}
+        if kwargs:
+            arguments.update(kwargs)
         return await self._run_with_retry(
             model_id="fal-ai/flux-pro",
-            arguments={
-                "prompt": prompt,
-                "aspect_ratio": aspect_ratio,
-                "num_images": 1,
-                **kwargs
-            }
+            arguments=arguments
         )
     
     async def _run_flux_kontext(self, image_url: str, prompt: str, guidance_scale: float, safety_tolerance: str, **kwargs) -> Dict[str, Any]:
         """Run FLUX Kontext model for image editing with retry logic."""
+        arguments = {
+            **_FLUX_KONTEXT_DEFAULTS,
+            "prompt": prompt,
+            "image_url": image_url,
+            "safety_tolerance": safety_tolerance
+        }
+        if kwargs:
+            arguments.update(kwargs)
         return await self._run_with_retry(
             model_id="fal-ai/flux-pro/kontext",
-            arguments={
-                "prompt": prompt,
-                "image_url": image_url,
-                "guidance_scale": 3.5,  # Always use 3.5 for optimal results
-                "safety_tolerance": safety_tolerance,
-                **kwargs
-            }
+            arguments=arguments
         )
     
     async def _run_kling_video(
         self, image_url: str, prompt: str, duration: int, aspect_ratio: str, **kwargs
     ) -> Dict[str, Any]:
         """Run Kling 2.1 video generation with retry logic."""
-        # Remove any hailuo-specific parameters and aspect_ratio (not supported by Kling)
-        kwargs_copy = kwargs.copy()
-        kwargs_copy.pop('prompt_optimizer', None)
-        kwargs_copy.pop('aspect_ratio', None)  # Remove if passed in kwargs
-        
-        # Extract Kling-specific parameters with defaults
-        negative_prompt = kwargs_copy.pop('negative_prompt', 'blur, distort, and low quality')
-        cfg_scale = kwargs_copy.pop('cfg_scale', 0.5)
+        # Only Kling-specific parameters are forwarded; anything else in kwargs is ignored
+        negative_prompt = kwargs.get('negative_prompt', 'blur, distort, and low quality')
+        cfg_scale = kwargs.get('cfg_scale', 0.5)
         
         return await self._run_with_retry(
             model_id="fal-ai/kling-video/v2.1/master/image-to-video",
@@ -261,54 +384,59 @@ class FALClient:
         self, image_url: str, prompt: str, duration: int, aspect_ratio: str, **kwargs
     ) -> Dict[str, Any]:
         """Run Hailuo 02 video generation with retry logic."""
-        # Remove any kling-specific parameters
-        kwargs_copy = kwargs.copy()
-        kwargs_copy.pop('motion_strength', None)
-        
-        # Extract prompt_optimizer with default True
-        prompt_optimizer = kwargs_copy.pop('prompt_optimizer', True)
+        arguments = {
+            "prompt": prompt,
+            "image_url": image_url,
+            "duration": str(duration),
+            "prompt_optimizer": kwargs.get('prompt_optimizer', True)
+        }
+        if kwargs:
+            # Pass through extra parameters, minus kling-specific ones
+            arguments.update({k: v for k, v in kwargs.items() if k not in _HAILUO_EXCLUDED_KWARGS})
         
         return await self._run_with_retry(
             model_id="fal-ai/minimax/hailuo-02/standard/image-to-video",
-            arguments={
-                "prompt": prompt,
-                "image_url": image_url,
-                "duration": str(duration),
-                "prompt_optimizer": prompt_optimizer,
-                **kwargs_copy
-            }
+            arguments=arguments
         )
     
     async def _run_lyria2(self, prompt: str, **kwargs) -> Dict[str, Any]:
         """Run Lyria 2 music generation with retry logic."""
+        arguments = {"prompt": prompt}
+        if kwargs:
+            arguments.update(kwargs)
         return await self._run_with_retry(
             model_id="fal-ai/lyria2",
-            arguments={
-                "prompt": prompt,
-                **kwargs
-            }
+            arguments=arguments
         )
     
     async def _run_minimax_speech(self, text: str, voice: str, speed: float, **kwargs) -> Dict[str, Any]:
         """Run MiniMax speech generation with retry logic."""
+        arguments = {
+            "text": text,
+            "voice_setting": {
+                "voice_id": voice,
+                "speed": speed
+            }
+        }
+        if kwargs:
+            arguments.update(kwargs)
         return await self._run_with_retry(
             model_id="fal-ai/minimax/speech-02-hd",
-            arguments={
-                "text": text,
-                "voice_setting": {
-                    "voice_id": voice,
-                    "speed": speed
-                },
-                **kwargs
-            }
+            arguments=arguments
         )
     
     async def upload_file(self, file_path: str) -> Dict[str, Any]:
         """Upload a file to FAL and get a URL, using cache to avoid duplicates."""
-        async def _do_upload(path: str) -> Dict[str, Any]:
-            """Inner function that performs the actual upload."""
+        async def _do_upload(path: str, file_size: int) -> Dict[str, Any]:
+            """Inner function that performs the actual upload, given the size the cache already stat'ed."""
             try:
-                url = await fal_client.upload_file_async(path)
+                # Large files are streamed so memory stays bounded by one chunk
+                if file_size > UPLOAD_CONFIG["multipart_threshold"]:
+                    url = await self._multipart_upload(path)
+                elif file_size > UPLOAD_CONFIG["stream_threshold"]:
+                    url = await self._streamed_upload(path, file_size)
+                else:
+                    url = await fal_client.upload_file_async(path)
                 return {
                     "success": True,
                     "url": url
@@ -320,121 +448,207 @@ class FALClient:
                 }
         
         # Use cache for the upload
-        return await self._upload_cache.get_or_upload(file_path, _do_upload)
+        result = await self._upload_cache.get_or_upload(file_path, _do_upload)
+        self._ensure_persist_task()
+        return result
+    
+    async def _streamed_upload(self, file_path: str, file_size: int) -> str:
+        """Upload a file to FAL storage in a single PUT, streamed from disk.
+        
+        fal_client.upload_file_async reads the whole file into memory first;
+        this keeps at most one read chunk in memory per concurrent upload.
+        """
+        path = Path(file_path)
+        content_type = mimetypes.guess_type(path.name)[0] or "application/octet-stream"
+        client = await self._get_http_client()
+        
+        response = await client.post(
+            f"{UPLOAD_CONFIG['rest_url']}/storage/upload/initiate",
+            params={"storage_type": UPLOAD_CONFIG["storage_type"]},
+            json={"content_type": content_type, "file_name": path.name},
+            headers={"Authorization": f"Key {self.api_key}"}
+        )
+        response.raise_for_status()
+        session = response.json()
+        
+        async def _read_chunks():
+            async with aiofiles.open(path, "rb") as f:
+                while chunk := await f.read(UPLOAD_CONFIG["stream_chunk_size"]):
+                    yield chunk
+        
+        response = await client.put(
+            session["upload_url"],
+            content=_read_chunks(),
+            headers={"Content-Type": content_type, "Content-Length": str(file_size)},
+            timeout=httpx.Timeout(300.0, connect=5.0)
+        )
+        response.raise_for_status()
+        
+        return session["file_url"]
+    
+    async def _multipart_upload(self, file_path: str) -> str:
+        """Upload a large file to FAL storage in fixed-size parts.
+        
+        Only one chunk is held in memory at a time, and each part is retried
+        independently so a transient failure does not restart the whole upload.
+        """
+        path = Path(file_path)
+        content_type = mimetypes.guess_type(path.name)[0] or "application/octet-stream"
+        chunk_size = UPLOAD_CONFIG["chunk_size"]
+        client = await self._get_http_client()
+        auth_headers = {"Authorization": f"Key {self.api_key}"}
+        
+        # Start the multipart session
+        response = await client.post(
+            f"{UPLOAD_CONFIG['rest_url']}/storage/upload/initiate-multipart",
+            params={"storage_type": UPLOAD_CONFIG["storage_type"]},
+            json={"content_type": content_type, "file_name": path.name},
+            headers=auth_headers
+        )
+        response.raise_for_status()
+        session = response.json()
+        upload_url = session["upload_url"]
+        file_url = session["file_url"]
+        
+        parts = []
+        part_number = 1
+        async with aiofiles.open(path, "rb") as f:
+            while chunk := await f.read(chunk_size):
+                for attempt in range(UPLOAD_CONFIG["part_max_retries"]):
+                    try:
+                        part_response = await client.put(
+                            f"{upload_url}/{part_number}",
+                            content=chunk,
+                            headers={"Content-Type": content_type},
+                            timeout=httpx.Timeout(120.0, connect=5.0)
+                        )
+                        part_response.raise_for_status()
+                        break
+                    except httpx.HTTPError:
+                        if attempt == UPLOAD_CONFIG["part_max_retries"] - 1:
+                            raise
+                        await asyncio.sleep(self._backoff(attempt))
+                
+                parts.append({"partNumber": part_number, "etag": part_response.headers.get("etag")})
+                part_number += 1
+        
+        # Finalize the upload
+        response = await client.post(f"{upload_url}/complete", json={"parts": parts})
+        response.raise_for_status()
+        
+        logger.info("Uploaded %s to FAL in %d parts", path.name, len(parts))
+        return file_url
 
     async def _run_with_queue(self, model_id: str, arguments: Dict[str, Any], progress_callback=None) -> Dict[str, Any]:
-        """Run FAL model using queue-based processing with polling."""
+        """Run FAL model using queue-based processing with status events."""
         last_error = None
+        self._ensure_background_tasks()
+        
+        # Use subscribe method for simpler queue handling
+        def on_queue_update(update):
+            # Log the update type for debugging
+            logger.debug("Queue update: %s", type(update))
+            
+            # Try to access logs if available
+            if hasattr(update, 'logs') and update.logs:
+                for log in update.logs:
+                    if isinstance(log, dict) and 'message' in log:
+                        logger.debug("[FAL] %s", log['message'])
+                    elif isinstance(log, str):
+                        logger.debug("[FAL] %s", log)
+        
+        # For longer videos (10s), use submit/poll pattern to avoid timeouts.
+        # The decision depends only on the arguments, so make it once rather than per attempt.
+        video_duration = int(arguments.get('duration', 5) or 5)
+        
+        # Use submit/poll for videos 10s or longer, or if explicitly requested
+        use_polling = (model_id.endswith('image-to-video') and video_duration >= 10) or arguments.get('use_polling', False)
+        if use_polling:
+            job_key = JobRegistry.make_key(model_id, arguments)
+            # For batch operations, use a shorter timeout to avoid blocking
+            batch_timeout = arguments.get('batch_timeout', self.timeout)
+        
+        # Job submitted by an earlier attempt; retries follow it instead of paying for a new one
+        handler = None
+        existing_job = None
+        job_id = None
         
         for attempt in range(self.max_retries):
             try:
-                # Use subscribe method for simpler queue handling
-                def on_queue_update(update):
-                    # Log the update type for debugging
-                    print(f"Queue update: {type(update)}")
-                    
-                    # Try to access logs if available
-                    if hasattr(update, 'logs') and update.logs:
-                        for log in update.logs:
-                            if isinstance(log, dict) and 'message' in log:
-                                print(f"[FAL] {log['message']}")
-                            elif isinstance(log, str):
-                                print(f"[FAL] {log}")
-                
-                print(f"Submitting job to queue for model: {model_id}")
-                
-                # For longer videos (10s), use submit/poll pattern to avoid timeouts
-                video_duration = arguments.get('duration', '5')
-                if isinstance(video_duration, str):
-                    video_duration = int(video_duration)
-                
-                # Use submit/poll for videos 10s or longer, or if explicitly requested
-                use_polling = (model_id.endswith('image-to-video') and video_duration >= 10) or arguments.get('use_polling', False)
+                logger.info("Submitting job to queue for model: %s", model_id)
                 
                 if use_polling:
-                    print(f"Using polling method for long-running job (duration: {video_duration}s)")
-                    print(f"Model: {model_id}")
-                    # Submit job
-                    handler = await fal_client.submit_async(model_id, arguments=arguments)
-                    request_id = handler.request_id
-                    print(f"Job submitted. Request ID: {request_id}")
-                    
-                    # Poll for completion
-                    poll_interval = 10  # seconds (reduced for faster feedback)
-                    # For batch operations, use a shorter timeout to avoid blocking
-                    batch_timeout = arguments.get('batch_timeout', self.timeout)
-                    max_polls = int(batch_timeout / poll_interval)
+                    logger.info("Using polling method for long-running %s job (duration: %ss)", model_id, video_duration)
+                    # A job left by an earlier process, or the one an earlier attempt submitted
+                    if existing_job is None:
+                        claimed = self._jobs.claim(job_key)
+                        if claimed:
+                            job_id, existing_job = claimed
                     
-                    for poll_count in range(max_polls):
-                        await asyncio.sleep(poll_interval)
-                        
-                        try:
-                            # Try to get result
-                            result = await fal_client.result_async(model_id, request_id)
-                            print(f"Job {request_id} completed successfully after {(poll_count + 1) * poll_interval} seconds!")
-                            return result
-                        except Exception as e:
-                            error_str = str(e).lower()
-                            # Check if this is a "not ready" error vs other errors
-                            if "not found" in error_str or "pending" in error_str or "in_queue" in error_str or "processing" in error_str:
-                                # Job is still processing, check status
-                                try:
-                                    status = await fal_client.status_async(model_id, request_id, with_logs=True)
-                                    if hasattr(status, 'logs') and status.logs:
-                                        for log in status.logs[-5:]:  # Show last 5 logs
-                                            if isinstance(log, dict) and 'message' in log:
-                                                print(f"[FAL] {log['message']}")
-                                            elif isinstance(log, str):
-                                                print(f"[FAL] {log}")
-                                except Exception as status_error:
-                                    print(f"Failed to get status for {request_id}: {status_error}")
-                                
-                                print(f"Job {request_id} still processing... ({(poll_count + 1) * poll_interval}s elapsed)")
-                            else:
-                                # This is an unexpected error, log it
-                                print(f"WARNING: Unexpected error polling {request_id}: {e}")
-                                # Don't break the loop - job might still be processing
+                    if existing_job and existing_job["status"] == "completed":
+                        # Result was collected by the resume task after a restart
+                        await self._jobs.remove(job_id)
+                        logger.info("Job %s already completed before restart", existing_job['request_id'])
+                        return existing_job["result"]
                     
-                    # Final attempt with better error handling
                     try:
-                        result = await fal_client.result_async(model_id, request_id)
-                        print(f"Job {request_id} completed on final attempt!")
-                        return result
+                        if existing_job:
+                            # Reattach to the job submitted before a restart instead of paying for it again
+                            request_id = existing_job["request_id"]
+                            logger.info("Reattaching to existing job. Request ID: %s", request_id)
+                            result = await self._poll_result(model_id, request_id, batch_timeout)
+                        else:
+                            # Submit job, persist it, then follow its status events
+                            handler = await fal_client.submit_async(model_id, arguments=arguments)
+                            job_id = await self._jobs.record(job_key, model_id, handler.request_id)
+                            existing_job = {"request_id": handler.request_id, "status": "pending"}
+                            logger.info("Job submitted. Request ID: %s", handler.request_id)
+                            result = await self._stream_result(model_id, handler, batch_timeout)
+                    except TimeoutError as e:
+                        # Job is still running - leave it registered so the next process resumes
+                        # it; this process never hands its own jobs to another caller
+                        raise RuntimeError(str(e))
                     except Exception as e:
-                        # Log the final error clearly
-                        elapsed_time = max_polls * poll_interval
-                        print(f"ERROR: Job {request_id} failed after {elapsed_time}s: {e}")
-                        raise RuntimeError(f"Job {request_id} timed out after {elapsed_time} seconds. Last error: {e}")
+                        # Transient errors keep the job registered so the retry reattaches to it
+                        if not self._is_retryable_error(e):
+                            await self._jobs.remove(job_id)
+                        raise
+                    
+                    await self._jobs.remove(job_id)
+                    return result
                 else:
-                    # Use subscribe for shorter jobs
-                    result = await fal_client.subscribe_async(
-                        model_id,
-                        arguments=arguments,
-                        on_queue_update=on_queue_update,
-                    )
+                    # Submit once and follow status events (what subscribe_async does),
+                    # keeping the handler so a retry can reclaim the same job
+                    if handler is None:
+                        handler = await fal_client.submit_async(model_id, arguments=arguments)
+                        logger.info("Job submitted. Request ID: %s", handler.request_id)
+                    else:
+                        logger.info("Retrying against existing job. Request ID: %s", handler.request_id)
+                    
+                    async for event in handler.iter_events(with_logs=True):
+                        on_queue_update(event)
+                    result = await handler.get()
                     
-                    print(f"Job completed successfully!")
+                    logger.info("Job completed successfully")
                     return result
                     
             except asyncio.TimeoutError:
                 last_error = f"Request timed out after {self.timeout} seconds"
                 if attempt < self.max_retries - 1:
-                    await asyncio.sleep(self.retry_delay * (attempt + 1))
+                    await asyncio.sleep(self._backoff(attempt))
                     continue
                     
             except Exception as e:
                 last_error = str(e)
                 
                 # Check for rate limiting or temporary errors
-                error_msg = str(e).lower()
-                if any(term in error_msg for term in ["rate limit", "too many requests", "503", "502"]):
+                if self._is_retryable_error(e):
                     if attempt < self.max_retries - 1:
-                        wait_time = self.retry_delay * (2 ** attempt)  # Exponential backoff
-                        await asyncio.sleep(wait_time)
+                        await asyncio.sleep(self._backoff(attempt))  # Jittered exponential backoff
                         continue
                 
                 # For downstream service errors, don't retry (it's a model issue)
-                if any(term in error_msg for term in ["downstream", "downstream_service_error"]):
+                if any(term in str(e).lower() for term in ["downstream", "downstream_service_error"]):
                     break
                 
                 # For other errors, don't retry
@@ -443,28 +657,272 @@ class FALClient:
         # All retries failed
         raise RuntimeError(f"FAL API call failed after {self.max_retries} attempts: {last_error}")
     
+    def _backoff(self, attempt: int) -> float:
+        """Capped exponential backoff with jitter so concurrent retries don't wake in lockstep.
+        
+        The cap applies after jitter, so no wait exceeds max_retry_delay.
+        """
+        return min(self.max_retry_delay, self.retry_delay * (2 ** attempt) * (1 + random.random()))
+    
+    @staticmethod
+    def is_cacheable(model_id: str, arguments: Dict[str, Any]) -> bool:
+        """Check whether a call is informational (repeatable) rather than a fresh generation.
+        
+        Only calls that pin every argument the model needs for determinism
+        (typically a seed) may be admitted to a result cache.
+        """
+        required = _CACHE_REQUIRES.get(model_id)
+        if not required:
+            return False
+        return all(arguments.get(name) not in (None, "random") for name in required)
+    
+    @staticmethod
+    def _slim_metadata(result: Dict[str, Any]) -> Dict[str, Any]:
+        """Keep only the allowlisted result fields, plus the raw result when debugging."""
+        metadata = {key: result[key] for key in _METADATA_KEEP if key in result}
+        if settings.debug:
+            metadata["_raw"] = result
+        return metadata
+    
+    @staticmethod
+    def extract_video_url(model_id: str, result: Any) -> Optional[str]:
+        """Pull the video URL out of a FAL result using the model's known result shape."""
+        if not isinstance(result, dict):
+            return None
+        return _URL_EXTRACTORS.get(model_id, _default_video_url)(result)
+    
+    @staticmethod
+    def _is_retryable_error(error: Exception) -> bool:
+        """Whether an error is transient (rate limiting or gateway errors) and worth retrying."""
+        error_msg = str(error).lower()
+        return any(term in error_msg for term in ["rate limit", "too many requests", "503", "502"])
+    
+    @staticmethod
+    def _is_pending_error(error: Exception) -> bool:
+        """Check whether a result error just means the job has not finished yet."""
+        error_str = str(error).lower()
+        return any(term in error_str for term in ["not found", "pending", "in_queue", "processing"])
+    
+    async def _stream_result(self, model_id: str, handler, timeout: float) -> Dict[str, Any]:
+        """Wait for a submitted job by following its status events.
+        
+        Returns as soon as FAL reports completion instead of waiting out a fixed
+        poll interval.
+        """
+        async def _follow_events() -> Dict[str, Any]:
+            logs_index = 0
+            async for event in handler.iter_events(with_logs=True):
+                # Process new logs
+                if isinstance(event, (fal_client.InProgress, fal_client.Completed)) and getattr(event, 'logs', None):
+                    new_logs = event.logs[logs_index:]
+                    logs_index = len(event.logs)
+                    for log in new_logs:
+                        if isinstance(log, dict) and 'message' in log:
+                            logger.debug("[FAL] %s", log['message'])
+                
+                if isinstance(event, fal_client.Completed):
+                    break
+            
+            return await handler.get()
+        
+        started = time.monotonic()
+        try:
+            result = await asyncio.wait_for(_follow_events(), timeout=timeout)
+        except asyncio.TimeoutError:
+            logger.error("Job %s still running after %ss", handler.request_id, timeout)
+            raise TimeoutError(f"Job {handler.request_id} timed out after {timeout} seconds")
+        
+        self._durations[model_id].append(time.monotonic() - started)
+        logger.info("Job %s completed successfully", handler.request_id)
+        return result
+    
+    async def _poll_result(self, model_id: str, request_id: str, timeout: float) -> Dict[str, Any]:
+        """Poll FAL for the result of a job by request ID until it completes or times out.
+        
+        Used when reattaching to a job from a previous run, where no handler exists.
+        """
+        # First check near when this model usually finishes, then back off geometrically
+        history = self._durations.get(model_id)
+        if history and len(history) >= 4:
+            delay = 0.7 * statistics.median(history)
+        else:
+            delay = self.poll_interval
+        started = time.monotonic()
+        deadline = started + timeout
+        
+        while time.monotonic() + delay < deadline:
+            await asyncio.sleep(delay)
+            delay = min(delay * 1.5, self.max_poll_interval)
+            elapsed = time.monotonic() - started
+            
+            try:
+                # Try to get result
+                result = await fal_client.result_async(model_id, request_id)
+                logger.info("Job %s completed successfully after %.0f seconds", request_id, elapsed)
+                return result
+            except Exception as e:
+                # Check if this is a "not ready" error vs other errors
+                if self._is_pending_error(e):
+                    # Job is still processing, check status
+                    try:
+                        status = await fal_client.status_async(model_id, request_id, with_logs=True)
+                        if hasattr(status, 'logs') and status.logs:
+                            for log in status.logs[-5:]:  # Show last 5 logs
+                                if isinstance(log, dict) and 'message' in log:
+                                    logger.debug("[FAL] %s", log['message'])
+                                elif isinstance(log, str):
+                                    logger.debug("[FAL] %s", log)
+                    except Exception as status_error:
+                        logger.debug("Failed to get status for %s: %s", request_id, status_error)
+                    
+                    logger.debug("Job %s still processing... (%.0fs elapsed)", request_id, elapsed)
+                else:
+                    # This is an unexpected error, log it
+                    logger.warning("Unexpected error polling %s: %s", request_id, e)
+                    # Don't break the loop - job might still be processing
+        
+        # Final attempt with better error handling
+        try:
+            result = await fal_client.result_async(model_id, request_id)
+            logger.info("Job %s completed on final attempt", request_id)
+            return result
+        except Exception as e:
+            # Log the final error clearly
+            elapsed_time = round(time.monotonic() - started)
+            logger.error("Job %s failed after %ss: %s", request_id, elapsed_time, e)
+            if self._is_pending_error(e):
+                raise TimeoutError(f"Job {request_id} timed out after {elapsed_time} seconds. Last error: {e}")
+            raise RuntimeError(f"Job {request_id} failed after {elapsed_time} seconds. Last error: {e}")
+    
+    def _ensure_background_tasks(self):
+        """Start job resumption and cache persistence, once per process.
+        
+        Both need a running event loop, so they start on first use rather than in __init__.
+        """
+        if self._resume_task is None and self._jobs.pending():
+            self._resume_task = asyncio.create_task(self._resume_pending_jobs())
+        self._ensure_persist_task()
+    
+    def _ensure_persist_task(self):
+        """Start cache persistence; called wherever the upload or result cache may change."""
+        if self._persist_task is None:
+            self._persist_task = asyncio.create_task(self._persist_caches_loop())
+    
+    async def _save_caches(self):
+        """Write the upload and result caches to disk if they changed.
+        
+        Each cache is copied on the event loop thread and only the copy is
+        serialized in a worker thread, so the loop can keep mutating the caches.
+        """
+        for cache, path in (
+            (self._upload_cache, self._upload_cache_path),
+            (self._result_cache, self._result_cache_path),
+        ):
+            snapshot = cache.snapshot()
+            if snapshot is None:
+                continue
+            try:
+                await asyncio.to_thread(cache.write_snapshot, path, snapshot)
+            except Exception as e:
+                cache.mark_dirty()
+                logger.warning("Failed to persist cache %s: %s", path, e)
+    
+    async def _persist_caches_loop(self):
+        """Periodically persist caches so a crash loses at most one interval of warm state."""
+        while True:
+            await asyncio.sleep(self.cache_persist_interval)
+            await self._save_caches()
+    
+    async def _resume_pending_jobs(self):
+        """Poll jobs submitted before a restart and keep their results for the next caller."""
+        async def _resume(job_id: str, job: Dict[str, Any]):
+            try:
+                result = await self._poll_result(job["model_id"], job["request_id"], self.timeout)
+                await self._jobs.complete(job_id, result)
+                logger.info("Resumed job %s completed", job['request_id'])
+            except TimeoutError:
+                logger.info("Resumed job %s still running, will retry on next start", job['request_id'])
+            except Exception as e:
+                await self._jobs.remove(job_id)
+                logger.warning("Resumed job %s failed: %s", job['request_id'], e)
+        
+        pending = self._jobs.pending()
+        logger.info("Resuming %d FAL jobs from previous run", len(pending))
+        await asyncio.gather(*[_resume(job_id, job) for job_id, job in pending])
+    
     async def _run_with_retry(self, model_id: str, arguments: Dict[str, Any]) -> Dict[str, Any]:
-        """Run FAL model with retry logic and error handling - now uses queue-based processing."""
-        return await self._run_with_queue(model_id, arguments)
+        """Run FAL model with retry logic and error handling - now uses queue-based processing.
+        
+        Results of deterministic calls are served from the result cache, and
+        concurrent deterministic calls with identical arguments share one
+        in-flight request. Every other call is a fresh generation of its own.
+        Pass _no_cache=True in arguments to bypass the result cache.
+        """
+        use_cache = not arguments.pop('_no_cache', False) and self.is_cacheable(model_id, arguments)
+        if not use_cache:
+            return await self._run_with_queue(model_id, arguments)
+        
+        key = JobRegistry.make_key(model_id, arguments)
+        cached = self._result_cache.get(key)
+        if cached is not None:
+            logger.debug("Result cache hit for model: %s", model_id)
+            return cached
+        
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            logger.debug("Joining in-flight request for model: %s", model_id)
+            return await asyncio.shield(inflight)
+        
+        future = asyncio.get_running_loop().create_future()
+        # Mark the exception retrieved so an unshared failure isn't reported as never awaited
+        future.add_done_callback(lambda f: f.cancelled() or f.exception())
+        self._inflight[key] = future
+        try:
+            result = await self._run_with_queue(model_id, arguments)
+            self._result_cache.put(key, result)
+            self._ensure_persist_task()
+            future.set_result(result)
+            return result
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            raise
+        finally:
+            self._inflight.pop(key, None)
     
     async def _get_http_client(self) -> httpx.AsyncClient:
-        """Get or create HTTP client with connection pooling"""
+        """Get or create HTTP client with connection pooling.
+        
+        HTTP/2 lets concurrent requests to FAL multiplex over a single connection;
+        the generous limits only matter when a host falls back to HTTP/1.1.
+        """
         if not self._http_client:
             self._http_client = httpx.AsyncClient(
+                http2=True,
                 timeout=httpx.Timeout(30.0, connect=5.0),
-                limits=httpx.Limits(max_keepalive_connections=5, max_connections=10)
+                limits=httpx.Limits(max_keepalive_connections=100, max_connections=1000)
             )
         return self._http_client
     
     async def cleanup(self):
         """Clean up resources - call this when shutting down"""
+        if self._persist_task:
+            self._persist_task.cancel()
+            self._persist_task = None
+        await self._save_caches()
+        
         if self._http_client:
             await self._http_client.aclose()
             self._http_client = None
     
     def get_cache_stats(self) -> Dict[str, Any]:
-        """Get upload cache statistics."""
-        return self._upload_cache.get_stats()
+        """Get upload and result cache statistics."""
+        return {
+            **self._upload_cache.get_stats(),
+            "results": self._result_cache.get_stats()
+        }
     
     # Queue-based submission methods
     
@@ -478,8 +936,6 @@ class FALClient:
         metadata: Optional[Dict[str, Any]] = None
     ) -> str:
         """Submit a generation task and return queue ID."""
-        from ..models import queue_manager
-        
         # Create queue task
         task = await queue_manager.create_task(
             task_type=task_type,
@@ -505,61 +961,108 @@ class FALClient:
         arguments: Dict[str, Any]
     ):
         """Process a queued task with status updates."""
-        from ..models import queue_manager, QueueStatus
+        job_key = JobRegistry.make_key(model_id, arguments)
+        job_id = None
+        self._ensure_background_tasks()
         
         try:
-            # Submit to FAL
-            handler = await fal_client.submit_async(model_id, arguments=arguments)
-            
-            # Update task with request ID
-            await queue_manager.update_task(
-                task_id,
-                request_id=handler.request_id
-            )
-            
-            # Process events
-            logs_index = 0
-            async for event in handler.iter_events(with_logs=True):
-                update_data = {}
-                
-                if isinstance(event, fal_client.Queued):
-                    update_data = {
-                        "status": QueueStatus.QUEUED,
-                        "queue_position": event.position
-                    }
-                    print(f"Task {task_id} queued at position {event.position}")
-                
-                elif isinstance(event, (fal_client.InProgress, fal_client.Completed)):
-                    if isinstance(event, fal_client.InProgress):
-                        update_data = {
-                            "status": QueueStatus.IN_PROGRESS,
-                            "started_at": datetime.now()
-                        }
+            # Bound concurrent FAL submissions; tasks waiting here stay QUEUED
+            async with self._submit_sem:
+                claimed = self._jobs.claim(job_key)
+                if claimed:
+                    job_id, existing_job = claimed
+                    # Job from a previous run - reuse its result or reattach instead of paying again
+                    await queue_manager.update_task(task_id, request_id=existing_job["request_id"])
+                    if existing_job["status"] == "completed":
+                        result = existing_job["result"]
+                    else:
+                        await queue_manager.update_task(
+                            task_id,
+                            status=QueueStatus.IN_PROGRESS,
+                            started_at=datetime.now()
+                        )
+                        result = await self._poll_result(model_id, existing_job["request_id"], self.timeout)
+                else:
+                    # Submit to FAL
+                    submitted_at = time.monotonic()
+                    handler = await fal_client.submit_async(model_id, arguments=arguments)
+                    job_id = await self._jobs.record(job_key, model_id, handler.request_id)
+                    
+                    # Update task with request ID
+                    await queue_manager.update_task(
+                        task_id,
+                        request_id=handler.request_id
+                    )
                     
-                    # Process new logs
-                    if hasattr(event, 'logs') and event.logs:
-                        new_logs = event.logs[logs_index:]
-                        logs_index = len(event.logs)
+                    # Process events, coalescing queue-manager writes: flush on status
+                    # transitions and completion, otherwise every few events or twice a second
+                    logs_index = 0
+                    events_seen = 0
+                    last_status = None
+                    last_flush = time.monotonic()
+                    pending_update: Dict[str, Any] = {}
+                    pending_logs: List[Dict[str, Any]] = []
+                    
+                    async def _flush_updates():
+                        nonlocal last_flush
+                        if pending_logs:
+                            task = await queue_manager.get_task(task_id)
+                            if task:
+                                task.logs.extend(pending_logs)
+                            pending_logs.clear()
+                        if pending_update:
+                            await queue_manager.update_task(task_id, **pending_update)
+                            pending_update.clear()
+                        last_flush = time.monotonic()
+                    
+                    try:
+                        async for event in handler.iter_events(with_logs=True):
+                            events_seen += 1
+                            status_changed = False
                         
-                        # Extract progress from logs
-                        for log in new_logs:
-                            if isinstance(log, dict):
-                                if 'progress' in log:
-                                    update_data['progress_percentage'] = log['progress']
-                                if 'message' in log:
-                                    print(f"[FAL] {log['message']}")
+                            if isinstance(event, fal_client.Queued):
+                                status_changed = last_status != QueueStatus.QUEUED
+                                last_status = QueueStatus.QUEUED
+                                pending_update["status"] = QueueStatus.QUEUED
+                                pending_update["queue_position"] = event.position
+                                logger.debug("Task %s queued at position %s", task_id, event.position)
                         
-                        # Add logs to task
-                        task = await queue_manager.get_task(task_id)
-                        if task:
-                            task.logs.extend(new_logs)
-                
-                # Update task
-                if update_data:
-                    await queue_manager.update_task(task_id, **update_data)
-            
-            # Get final result
-            result = await handler.get()
+                            elif isinstance(event, (fal_client.InProgress, fal_client.Completed)):
+                                if isinstance(event, fal_client.InProgress) and last_status != QueueStatus.IN_PROGRESS:
+                                    status_changed = True
+                                    last_status = QueueStatus.IN_PROGRESS
+                                    pending_update["status"] = QueueStatus.IN_PROGRESS
+                                    pending_update["started_at"] = datetime.now()
+                        
+                                # Process new logs
+                                if hasattr(event, 'logs') and event.logs:
+                                    new_logs = event.logs[logs_index:]
+                                    logs_index = len(event.logs)
+                        
+                                    # Extract progress from logs
+                                    for log in new_logs:
+                                        if isinstance(log, dict):
+                                            if 'progress' in log:
+                                                pending_update['progress_percentage'] = log['progress']
+                                            if 'message' in log:
+                                                logger.debug("[FAL] %s", log['message'])
+                        
+                                    pending_logs.extend(new_logs)
+                        
+                            if (
+                                status_changed
+                                or isinstance(event, fal_client.Completed)
+                                or events_seen % 5 == 0
+                                or time.monotonic() - last_flush > 0.5
+                            ):
+                                await _flush_updates()
+                    finally:
+                        await _flush_updates()
+                    
+                    # Get final result
+                    result = await handler.get()
+                    self._durations[model_id].append(time.monotonic() - submitted_at)
+            await self._jobs.remove(job_id)
             
             # Update task as completed
             await queue_manager.update_task(
@@ -570,7 +1073,7 @@ class FALClient:
                 progress_percentage=100.0
             )
             
-            print(f"Task {task_id} completed successfully!")
+            logger.info("Task %s completed successfully", task_id)
             
             # Handle post-processing for video generation tasks
             task = await queue_manager.get_task(task_id)
@@ -579,6 +1082,7 @@ class FALClient:
             
         except asyncio.CancelledError:
             # Task was cancelled
+            await self._jobs.remove(job_id)
             await queue_manager.update_task(
                 task_id,
                 status=QueueStatus.CANCELLED,
@@ -589,13 +1093,14 @@ class FALClient:
             
         except Exception as e:
             # Task failed
+            await self._jobs.remove(job_id)
             await queue_manager.update_task(
                 task_id,
                 status=QueueStatus.FAILED,
                 completed_at=datetime.now(),
                 error_message=str(e)
             )
-            print(f"Task {task_id} failed: {e}")
+            logger.error("Task %s failed: %s", task_id, e)
             raise
             
         finally:
@@ -604,8 +1109,6 @@ class FALClient:
     
     async def get_queue_status(self, task_id: str) -> Optional[Dict[str, Any]]:
         """Get status of a queued task."""
-        from ..models import queue_manager
-        
         task = await queue_manager.get_task(task_id)
         if task:
             return task.dict()
@@ -613,27 +1116,25 @@ class FALClient:
     
     async def _process_video_completion(self, task, result):
         """Process video completion - create asset and associate with scene."""
-        from ..models import ProjectManager, Asset, AssetType, AssetSource
-        from ..services import asset_storage
-        
         try:
-            # Extract video URL from result
-            video_url = None
-            if isinstance(result, dict):
-                video_url = result.get("video", {}).get("url") or result.get("url") or result.get("output_url")
+            video_url = self.extract_video_url(task.model, result)
             
             if not video_url:
-                print(f"WARNING: No video URL found in result for task {task.id}")
+                logger.warning("No video URL found in result for task %s", task.id)
                 return
             
             # Get metadata from task
             metadata = task.metadata or {}
             
+            # Stamp the asset and project with the task's completion time
+            now = task.completed_at or datetime.now()
+            
             # Create asset
             asset = Asset(
                 type=AssetType.VIDEO,
                 source=AssetSource.GENERATED,
                 url=video_url,
+                created_at=now,
                 cost=metadata.get("cost", 0.0),
                 metadata={
                     "model": metadata.get("model"),
@@ -645,40 +1146,50 @@ class FALClient:
                 generation_params=metadata
             )
             
-            # Download asset
+            # Start the download, then resolve the target scene while it runs
+            download_task = None
             if task.project_id:
-                download_result = await asset_storage.download_asset(
+                download_task = asyncio.create_task(asset_storage.download_asset(
                     url=video_url,
                     project_id=task.project_id,
                     asset_id=asset.id,
                     asset_type="video"
-                )
-                
-                if download_result.get("success"):
-                    asset.local_path = download_result["local_path"]
+                ))
+            
+            scene = None
+            try:
+                if task.project_id and task.scene_id:
+                    project = ProjectManager.get_project(task.project_id)
+                    scene = next((s for s in project.scenes if s.id == task.scene_id), None)
+            finally:
+                if download_task:
+                    download_result = await download_task
+                    if download_result.get("success"):
+                        asset.local_path = download_result["local_path"]
+                        # Probe once now so assembly can reuse it instead of probing again
+                        ffmpeg_wrapper = await get_ffmpeg_wrapper_async()
+                        probe = await ffmpeg_wrapper.get_video_info(asset.local_path)
+                        if "error" not in probe:
+                            asset.probe = probe
             
             # Associate with scene if specified
             if task.project_id and task.scene_id:
-                project = ProjectManager.get_project(task.project_id)
-                scene = next((s for s in project.scenes if s.id == task.scene_id), None)
-                
                 if scene:
                     scene.assets.append(asset)
                     # Update scene duration if needed
                     if "duration" in metadata and scene.duration != metadata["duration"]:
-                        scene.duration = metadata["duration"]
+                        project.set_scene_duration(scene, metadata["duration"])
                     
-                    # Update project
-                    project.total_cost = project.calculate_cost()
-                    project.actual_duration = project.calculate_duration()
-                    project.updated_at = datetime.now()
+                    # Update project totals incrementally
+                    project.add_asset_cost(asset.cost)
+                    project.updated_at = now
                     
-                    print(f"Video asset {asset.id} associated with scene {scene.id}")
+                    logger.info("Video asset %s associated with scene %s", asset.id, scene.id)
                 else:
-                    print(f"WARNING: Scene {task.scene_id} not found for video asset")
+                    logger.warning("Scene %s not found for video asset", task.scene_id)
             
         except Exception as e:
-            print(f"ERROR processing video completion: {e}")
+            logger.error("Error processing video completion: %s", e)
     
     async def wait_for_task(
         self,
@@ -686,10 +1197,14 @@ class FALClient:
         timeout: Optional[float] = None,
         poll_interval: float = 2.0
     ) -> Dict[str, Any]:
-        """Wait for a queued task to complete."""
-        from ..models import queue_manager, QueueStatus
+        """Wait for a queued task to complete.
         
-        start_time = time.time()
+        A timeout of None or 0 waits indefinitely. The queue manager wakes the
+        waiter as soon as the task reaches a terminal status; tasks without a
+        completion event are polled every poll_interval seconds instead.
+        """
+        deadline = time.monotonic() + timeout if timeout else None
+        event = queue_manager.get_event(task_id)
         
         while True:
             task = await queue_manager.get_task(task_id)
@@ -705,12 +1220,18 @@ class FALClient:
             if task.status == QueueStatus.CANCELLED:
                 return {"success": False, "error": "Task was cancelled"}
             
-            # Check timeout
-            if timeout and (time.time() - start_time) > timeout:
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
                 return {"success": False, "error": f"Timeout after {timeout} seconds"}
             
-            # Wait before next check
-            await asyncio.sleep(poll_interval)
+            if event is not None:
+                try:
+                    await asyncio.wait_for(event.wait(), timeout=remaining)
+                except asyncio.TimeoutError:
+                    return {"success": False, "error": f"Timeout after {timeout} seconds"}
+                event = None  # Already set; any further wait has to poll
+            else:
+                await asyncio.sleep(poll_interval if remaining is None else min(poll_interval, remaining))
 
 
 # Singleton instance
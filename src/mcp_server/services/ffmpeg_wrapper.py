@@ -2,22 +2,187 @@
 
 import os
 import asyncio
+import functools
+import hashlib
+import itertools
 import json
 import sys
 import platform
+import re
+import shlex
 import shutil
+from collections import OrderedDict, deque
 from pathlib import Path
-from typing import Dict, Any, List, Optional, Tuple
+from typing import Deque, Dict, Any, List, Optional, Tuple
 import subprocess
 from ..config import settings
 
+try:
+    import av  # Optional: PyAV reads container metadata in-process instead of spawning ffprobe
+except ImportError:
+    av = None
+
+
+# Hardware H.264 encoders in order of preference, tried when FFMPEG_HW_ENCODER is "auto"
+HW_H264_ENCODERS = ("h264_nvenc", "h264_qsv", "h264_videotoolbox", "h264_amf")
+
+# libx264 preset names mapped to NVENC's p1 (fastest) .. p7 (slowest)
+NVENC_PRESETS = {
+    "ultrafast": "p1", "superfast": "p1", "veryfast": "p2", "faster": "p3",
+    "fast": "p3", "medium": "p4", "slow": "p5", "slower": "p6", "veryslow": "p7"
+}
+
+# libx264 preset names QSV accepts as-is
+QSV_PRESETS = frozenset({"veryfast", "faster", "fast", "medium", "slow", "slower", "veryslow"})
+
+# Scale-and-pad filters for each supported aspect ratio
+ASPECT_RATIO_FILTERS = {
+    "16:9": "scale=1920:1080:force_original_aspect_ratio=decrease,pad=1920:1080:(ow-iw)/2:(oh-ih)/2",
+    "9:16": "scale=1080:1920:force_original_aspect_ratio=decrease,pad=1080:1920:(ow-iw)/2:(oh-ih)/2",
+    "1:1": "scale=1080:1080:force_original_aspect_ratio=decrease,pad=1080:1080:(ow-iw)/2:(oh-ih)/2",
+    "4:5": "scale=864:1080:force_original_aspect_ratio=decrease,pad=864:1080:(ow-iw)/2:(oh-ih)/2"
+}
+
+# Platform-specific export settings
+PLATFORM_EXPORT_SETTINGS = {
+    "youtube": {
+        "codec": "copy",
+        "preset": "slow",
+        "crf": "18",
+        "audio_bitrate": "384k"
+    },
+    "tiktok": {
+        "codec": "copy",
+        "preset": "medium",
+        "crf": "23",
+        "audio_bitrate": "256k",
+        "max_size": "287M"  # TikTok limit
+    },
+    "instagram_reel": {
+        "codec": "copy",
+        "preset": "medium",
+        "crf": "23",
+        "audio_bitrate": "256k",
+        "max_size": "100M"
+    }
+}
+
+# Input options for reading a concat script from stdin; genpts regenerates PTS that
+# inpoints between keyframes leave missing
+CONCAT_PIPE_INPUT = (
+    "-fflags", "+genpts",
+    "-f", "concat",
+    "-safe", "0",
+    "-protocol_whitelist", "file,pipe",
+    "-i", "pipe:0"
+)
+
+# Seconds trimmed from the start of every clip after the first (end videos play in full)
+CLIP_TRIM_SECONDS = 0.5
+
+# When stream-copying, a trim snaps forward to a keyframe at most this many seconds later
+KEYFRAME_SNAP_WINDOW = 0.5
+
+# Audio files that already hold AAC and can be stream-copied into MP4 unchanged
+AAC_AUDIO_EXTENSIONS = frozenset({".aac", ".m4a"})
+
+# asyncio StreamReader limit for subprocess pipes (reading pauses at twice this)
+SUBPROCESS_STREAM_LIMIT = 1024 * 1024
+
+# Global options that keep ffmpeg's stderr down to actual errors
+QUIET_ARGS = ("-hide_banner", "-nostats", "-loglevel", "error")
+
+# Only the ffprobe fields _probe_with_ffprobe reads, keeping its JSON small on multi-stream files
+FFPROBE_ENTRIES = "format=duration,size,bit_rate:stream=codec_type,codec_name,width,height,r_frame_rate,pix_fmt,time_base"
+
+# ffmpeg stderr is read in chunks of this size, keeping only the last lines for error reports
+STDERR_READ_SIZE = 64 * 1024
+STDERR_TAIL_LINES = 200
+STDERR_LINE_BREAK = re.compile(rb"[\r\n]")
+
+# Watermark text longer than this is handed to drawtext through a textfile
+DRAWTEXT_INLINE_MAX_CHARS = 200
+DRAWTEXT_STYLE = "fontcolor=white:fontsize=24:x=10:y=10"
+
+# Characters that need a backslash in a filter option value, then in the filtergraph itself
+_OPTION_VALUE_SPECIAL = re.compile(r"([\\':])")
+_FILTERGRAPH_SPECIAL = re.compile(r"([\\'\[\],;])")
+
+
+def _escape_filter_value(value: str) -> str:
+    """Escape value for use as a filter option inside a -vf filtergraph."""
+    return _FILTERGRAPH_SPECIAL.sub(r"\\\1", _OPTION_VALUE_SPECIAL.sub(r"\\\1", value))
+
+
+@functools.lru_cache(maxsize=128)
+def _drawtext_filter(text: str) -> str:
+    """drawtext filter that stamps text in the top-left corner.
+
+    Text is escaped for both parsing levels and drawn with expansion
+    disabled, so user input cannot inject filters or %{...} expressions.
+    Long text goes through a content-addressed textfile in the cache dir.
+    """
+    if len(text) > DRAWTEXT_INLINE_MAX_CHARS:
+        digest = hashlib.sha256(text.encode("utf-8")).hexdigest()[:16]
+        text_path = settings.cache_dir / f"watermark_{digest}.txt"
+        if not text_path.exists():
+            tmp_path = text_path.with_suffix('.tmp')
+            tmp_path.write_text(text, encoding="utf-8")
+            os.replace(tmp_path, text_path)
+        source = f"textfile={_escape_filter_value(str(text_path))}"
+    else:
+        source = f"text={_escape_filter_value(text)}"
+    return f"drawtext=expansion=none:{source}:{DRAWTEXT_STYLE}"
+
 
 class FFmpegWrapper:
     """Wrapper for FFmpeg operations."""
     
     def __init__(self):
         self.ffmpeg_path = settings.ffmpeg_path
+        self._capabilities_path = settings.cache_dir / "ffmpeg_capabilities.json"
+        self._h264_codec = self._load_capabilities()
+        
+        # Probe results keyed by (absolute path, mtime_ns, size), so a rewritten file is re-probed
+        self._probe_cache: "OrderedDict[Tuple[str, int, int], Dict[str, Any]]" = OrderedDict()
+        self._probe_cache_size = 256
+        self._probe_semaphore = asyncio.Semaphore(os.cpu_count() or 4)  # Concurrent ffprobe processes
+        
+        # Cap concurrent ffmpeg runs and split the CPUs between them, so parallel
+        # encodes don't each spawn a full set of libx264 threads
+        self._encode_semaphore = asyncio.Semaphore(settings.ffmpeg_max_concurrency)
+        self._threads_per_invocation = max(1, (os.cpu_count() or 4) // settings.ffmpeg_max_concurrency)
+    
+    def _load_capabilities(self) -> str:
+        """Check ffmpeg and pick the H.264 encoder, reusing the last run's result.
+        
+        Checking runs several ffmpeg processes, so the outcome is saved next to the
+        other caches, keyed by the binary's path, mtime and size plus the encoder
+        setting. Replacing ffmpeg or changing FFMPEG_HW_ENCODER re-runs the checks.
+        """
+        binary = shutil.which(self.ffmpeg_path)
+        key = None
+        if binary:
+            binary_stat = os.stat(binary)
+            key = f"{binary}:{binary_stat.st_mtime_ns}:{binary_stat.st_size}:{settings.ffmpeg_hw_encoder}"
+            try:
+                saved = json.loads(self._capabilities_path.read_text())
+                if saved.get("key") == key:
+                    return saved["h264_codec"]
+            except (OSError, ValueError, KeyError):
+                pass
+        
         self._check_ffmpeg()
+        codec = self._select_h264_encoder()
+        
+        if key:
+            try:
+                tmp_path = self._capabilities_path.with_suffix('.tmp')
+                tmp_path.write_text(json.dumps({"key": key, "h264_codec": codec}))
+                os.replace(tmp_path, self._capabilities_path)
+            except OSError as e:
+                print(f"[FFmpeg] Could not save ffmpeg capabilities: {e}", file=sys.stderr)
+        return codec
     
     def _check_ffmpeg(self):
         """Check if ffmpeg is available."""
@@ -30,21 +195,113 @@ class FFmpegWrapper:
                 "Please install FFmpeg or set FFMPEG_PATH environment variable."
             )
     
+    def _select_h264_encoder(self) -> str:
+        """Pick the H.264 encoder used for re-encodes, preferring working hardware encoders.
+        
+        Builds often list hardware encoders without the device being present,
+        so each candidate must complete a tiny test encode before it is used.
+        """
+        choice = settings.ffmpeg_hw_encoder
+        if choice == "none":
+            return "libx264"
+        candidates = HW_H264_ENCODERS if choice == "auto" else (choice,)
+        
+        try:
+            listed = subprocess.run(
+                [self.ffmpeg_path, "-hide_banner", "-encoders"],
+                capture_output=True, text=True, timeout=10
+            ).stdout
+        except (subprocess.SubprocessError, OSError):
+            return "libx264"
+        
+        for encoder in candidates:
+            if encoder not in listed:
+                continue
+            try:
+                subprocess.run(
+                    [self.ffmpeg_path, "-hide_banner", "-loglevel", "error",
+                     "-f", "lavfi", "-i", "color=size=256x256:duration=0.1",
+                     "-c:v", encoder, "-f", "null", "-"],
+                    capture_output=True, check=True, timeout=15
+                )
+            except (subprocess.SubprocessError, OSError):
+                continue
+            print(f"[FFmpeg] Using hardware encoder {encoder}", file=sys.stderr)
+            return encoder
+        
+        return "libx264"
+    
+    def _h264_encode_args(self, preset: str = "fast", crf: int = 23, codec: Optional[str] = None) -> List[str]:
+        """Build video codec arguments, translating libx264 preset/CRF for hardware encoders."""
+        codec = codec or self._h264_codec
+        if codec == "h264_nvenc":
+            return ["-c:v", codec, "-preset", NVENC_PRESETS.get(preset, "p4"), "-rc", "vbr", "-cq", str(crf), "-b:v", "0"]
+        if codec == "h264_qsv":
+            return ["-c:v", codec, "-preset", preset if preset in QSV_PRESETS else "medium", "-global_quality", str(crf)]
+        if codec == "h264_videotoolbox":
+            # VideoToolbox quality runs 1-100, higher is better; CRF 18..28 maps to roughly 75..50
+            return ["-c:v", codec, "-q:v", str(max(1, min(100, 120 - crf * 5 // 2)))]
+        if codec == "h264_amf":
+            return ["-c:v", codec, "-rc", "cqp", "-qp_i", str(crf), "-qp_p", str(crf)]
+        return ["-c:v", "libx264", "-preset", preset, "-crf", str(crf)]
+    
+    async def _run_encode(
+        self,
+        cmd: List[str],
+        timeout: int,
+        input_bytes: Optional[bytes] = None,
+        preset: str = "fast",
+        crf: int = 23
+    ) -> Dict[str, Any]:
+        """Run a command built with _h264_encode_args(preset, crf), retrying once with
+        libx264 if the hardware encoder fails.
+        
+        A hardware encoder can pass the startup test encode and still fail on a real
+        job (session limits, unsupported frame sizes). The retry rewrites cmd in place
+        so callers report the command that actually ran. If libx264 then succeeds,
+        later encodes use it directly instead of failing in hardware first.
+        """
+        try:
+            return await self._run_ffmpeg(cmd, timeout=timeout, input_bytes=input_bytes)
+        except RuntimeError as e:
+            if self._h264_codec == "libx264":
+                raise
+            hw_args = self._h264_encode_args(preset, crf)
+            start = next(
+                (i for i in range(len(cmd) - len(hw_args) + 1) if cmd[i:i + len(hw_args)] == hw_args),
+                None
+            )
+            if start is None:
+                raise  # Nothing was encoded in hardware, so software won't help
+            print(f"[FFmpeg] {self._h264_codec} failed, retrying with libx264: {e}", file=sys.stderr)
+            cmd[start:start + len(hw_args)] = self._h264_encode_args(preset, crf, codec="libx264")
+            result = await self._run_ffmpeg(cmd, timeout=timeout, input_bytes=input_bytes)
+            if self._h264_codec != "libx264":
+                print(f"[FFmpeg] Switching H.264 encoding from {self._h264_codec} to libx264", file=sys.stderr)
+                self._h264_codec = "libx264"
+            return result
+    
     async def concat_videos(
         self,
         video_paths: List[str],
         output_path: str,
-        quality_preset: str = "high"
+        quality_preset: str = "high",
+        video_infos: Optional[List[Optional[Dict[str, Any]]]] = None
     ) -> Dict[str, Any]:
-        """Concatenate multiple videos with dynamic transitions by trimming first 0.5 seconds from clips starting from the second one."""
+        """Concatenate multiple videos with dynamic transitions by trimming first 0.5 seconds from clips starting from the second one.
+        
+        video_infos, if given, holds a get_video_info() result (or None) per path;
+        only the paths without one are probed.
+        """
         try:
-            # Check if videos have audio streams
-            has_audio = True
+            # Check if videos have audio streams (probed concurrently, once per file)
+            input_infos = await self._known_video_infos(video_paths, video_infos)
+            has_audio = all(
+                not info.get("error") and info.get("has_audio", True) for info in input_infos
+            )
             if video_paths:
-                first_video_info = await self.get_video_info(video_paths[0])
-                if first_video_info.get("error") or not first_video_info.get("has_audio", True):
-                    has_audio = False
                 print(f"[FFmpeg] Videos have audio: {has_audio}", file=sys.stderr)
+            inpoints = self._clip_inpoints(video_paths)
             
             if len(video_paths) == 1:
                 # Single video, just copy
@@ -68,92 +325,28 @@ class FFmpegWrapper:
                 
                 result = await self._run_ffmpeg(cmd, timeout=300)
             else:
-                # Multiple videos - trim and concatenate
-                # First, create trimmed versions using simple -ss
-                trimmed_paths = []
-                temp_files_created = []
-                
-                for i, video_path in enumerate(video_paths):
-                    # Check if this is the end video (h2a_end.mp4)
-                    is_end_video = "h2a_end.mp4" in video_path
-                    
-                    if i == 0 or is_end_video:
-                        # First video or end video - use as is
-                        trimmed_paths.append(video_path)
-                        if is_end_video:
-                            print(f"[FFmpeg] Using end video without trimming: {video_path}", file=sys.stderr)
-                    else:
-                        # Trim first 0.5 seconds using -ss
-                        trimmed_path = settings.temp_dir / f"trimmed_{os.getpid()}_{i}.mp4"
-                        temp_files_created.append(trimmed_path)
-                        
-                        trim_cmd = [
-                            self.ffmpeg_path,
-                            "-ss", "0.5",  # Skip first 0.5 seconds
-                            "-i", str(video_path),
-                            "-c:v", "copy"  # Copy codec!
-                        ]
-                        
-                        # Handle audio properly
-                        if has_audio:
-                            trim_cmd.extend(["-c:a", "copy"])
-                        else:
-                            trim_cmd.append("-an")
-                        
-                        trim_cmd.extend([
-                            "-avoid_negative_ts", "make_zero",  # Handle timestamp issues
-                            "-y",
-                            str(trimmed_path)
-                        ])
-                        
-                        trim_result = await self._run_ffmpeg(trim_cmd)
-                        if trim_result.get("success"):
-                            trimmed_paths.append(str(trimmed_path))
-                            print(f"[FFmpeg] Successfully trimmed video {i}", file=sys.stderr)
-                        else:
-                            # If trimming fails, use original
-                            print(f"[FFmpeg] Trim failed for video {i}, using original", file=sys.stderr)
-                            trimmed_paths.append(video_path)
-                
-                # Now concatenate using the concat demuxer
-                concat_file = settings.temp_dir / f"concat_{os.getpid()}.txt"
-                temp_files_created.append(concat_file)
-                
-                # Verify all input files before concatenation
-                print(f"[FFmpeg] Verifying {len(trimmed_paths)} input files for concatenation", file=sys.stderr)
-                for i, path in enumerate(trimmed_paths):
-                    if not Path(path).exists():
-                        print(f"[FFmpeg] ERROR: Input file {i} does not exist: {path}", file=sys.stderr)
-                    else:
-                        info = await self.get_video_info(path)
-                        print(f"[FFmpeg] Input {i}: {Path(path).name} - {info.get('width', 0)}x{info.get('height', 0)}, {info.get('duration', 0):.2f}s", file=sys.stderr)
-                
-                with open(concat_file, 'w') as f:
-                    for path in trimmed_paths:
-                        # Use absolute paths and escape single quotes
-                        escaped_path = str(Path(path).resolve()).replace("'", "'\\''")
-                        f.write(f"file '{escaped_path}'\n")
+                # Multiple videos - trim and concatenate in one pass. The concat demuxer
+                # seeks each clip to its inpoint itself, so no separate trim runs or
+                # intermediate files are needed, and the list is fed through stdin.
+                if self._streams_match(input_infos):
+                    inpoints = await self._snap_to_keyframes(video_paths, inpoints)
+                    concat_list = self._concat_list(video_paths, input_infos, inpoints)
+                    cmd = [self.ffmpeg_path, *CONCAT_PIPE_INPUT, "-c", "copy"]  # Copy everything!
+                else:
+                    # The concat demuxer needs identical stream parameters, so clips that
+                    # differ are trimmed, normalized and joined in one filter graph instead
+                    print("[FFmpeg] Input stream parameters differ, re-encoding concat output", file=sys.stderr)
+                    concat_list = None
+                    cmd = [self.ffmpeg_path, *self._concat_filter_args(video_paths, input_infos, inpoints, has_audio)]
                 
-                concat_cmd = [
-                    self.ffmpeg_path,
-                    "-f", "concat",
-                    "-safe", "0",
-                    "-i", str(concat_file),
-                    "-c", "copy",  # Copy everything!
+                cmd.extend([
+                    "-avoid_negative_ts", "make_zero",
                     "-movflags", "+faststart",
                     "-y",
                     str(output_path)
-                ]
-                
-                result = await self._run_ffmpeg(concat_cmd, timeout=300)
+                ])
                 
-                # Clean up temp files
-                for temp_file in temp_files_created:
-                    try:
-                        if temp_file.exists():
-                            temp_file.unlink()
-                    except:
-                        pass
+                result = await self._run_encode(cmd, timeout=300, input_bytes=concat_list)
             
             if not result.get("success", False):
                 return result
@@ -161,18 +354,131 @@ class FFmpegWrapper:
             # Get output info
             output_info = await self.get_video_info(output_path)
             
-            # Calculate trimmed seconds (exclude end video from trimming count)
-            end_video_count = sum(1 for path in video_paths if "h2a_end.mp4" in path)
-            trimmed_video_count = len(video_paths) - 1 - end_video_count  # -1 for first video, -end_video_count for end videos
-            trimmed_seconds = 0.5 * max(0, trimmed_video_count)
+            output_size = output_info.get("size") or (await self._stat(output_path)).st_size
+            
+            return {
+                "success": True,
+                "output_path": output_path,
+                "duration": output_info.get("duration", 0),
+                "size": output_size,
+                "width": output_info.get("width"),
+                "height": output_info.get("height"),
+                "fps": output_info.get("fps"),
+                "has_audio": output_info.get("has_audio", False),
+                "trimmed_seconds": round(sum(inpoints), 3),
+                "command": shlex.join(cmd)
+            }
+            
+        except Exception as e:
+            return {
+                "success": False,
+                "error": str(e)
+            }
+    
+    async def concat_and_export(
+        self,
+        video_paths: List[str],
+        output_path: str,
+        platform: Optional[str] = None,
+        include_watermark: bool = False,
+        watermark_text: Optional[str] = None,
+        audio_tracks: Optional[List[Dict[str, Any]]] = None,
+        video_infos: Optional[List[Optional[Dict[str, Any]]]] = None
+    ) -> Dict[str, Any]:
+        """Concatenate clips and export them for a platform in a single ffmpeg run.
+        
+        Produces the same result as concat_videos followed by export_for_platform,
+        without the intermediate file and with at most one video encode. When
+        audio_tracks is given (same format as add_multiple_audio_tracks), they are
+        mixed and replace the clips' audio in the same run. video_infos works as
+        in concat_videos.
+        
+        Without a platform no export settings apply (no audio bitrate, no size
+        cap): audio is handled exactly as concat_videos and add_multiple_audio_tracks
+        would, which is what assembly needs.
+        
+        The clips go through the concat demuxer, so they must share stream
+        parameters (see streams_match); mismatched clips are rejected and belong
+        in concat_videos, which normalizes them in a filter graph.
+        """
+        try:
+            if not video_paths:
+                raise ValueError("No videos to concatenate")
+            
+            input_infos = await self._known_video_infos(video_paths, video_infos)
+            if not self._streams_match(input_infos):
+                return {
+                    "success": False,
+                    "error": "Input stream parameters differ; concatenate with concat_videos instead"
+                }
+            inpoints = self._clip_inpoints(video_paths)
+            add_watermark = bool(include_watermark and watermark_text)
+            copy_video = not add_watermark
+            if copy_video:
+                inpoints = await self._snap_to_keyframes(video_paths, inpoints)
+            concat_list = self._concat_list(video_paths, input_infos, inpoints)
+            export_settings = self._platform_export_settings(platform) if platform else {}
+            
+            cmd = [self.ffmpeg_path, *CONCAT_PIPE_INPUT]
+            
+            filter_complex = None
+            if audio_tracks:
+                cmd.extend(self._audio_input_args(audio_tracks))
+                filter_complex, audio_output = self._audio_mix_filter(audio_tracks)
+                if filter_complex:
+                    cmd.extend(["-filter_complex", filter_complex])
+                cmd.extend(["-map", "0:v", "-map", audio_output])
+                print(f"[FFmpeg] Mixing {len(audio_tracks)} audio tracks into export", file=sys.stderr)
+            
+            if add_watermark:
+                cmd.extend(["-vf", _drawtext_filter(watermark_text)])
+                cmd.extend(self._h264_encode_args("fast", 23))  # Must re-encode when adding watermark
+                cmd.extend(["-pix_fmt", "yuv420p"])
+            else:
+                cmd.extend(["-c:v", "copy"])
+            
+            if export_settings:
+                cmd.extend(["-c:a", "aac", "-b:a", export_settings["audio_bitrate"]])
+            elif audio_tracks:
+                cmd.extend(self._audio_codec_args(audio_tracks[0]["path"], filter_complex is not None))
+            else:
+                cmd.extend(["-c:a", "copy"])  # The clips' own audio, as concat_videos keeps it
+            
+            cmd.extend([
+                "-avoid_negative_ts", "make_zero",
+                "-movflags", "+faststart",
+                "-y"
+            ])
+            
+            # Add size limit if specified
+            if "max_size" in export_settings:
+                cmd.extend(["-fs", export_settings["max_size"]])
+            
+            cmd.append(str(output_path))
+            
+            result = await self._run_encode(cmd, timeout=300, input_bytes=concat_list)
+            
+            if not result.get("success", False):
+                return result
+            
+            output_info = await self.get_video_info(output_path)
+            output_size = output_info.get("size") or (await self._stat(output_path)).st_size
             
             return {
                 "success": True,
                 "output_path": output_path,
+                "platform": platform,
+                "size": output_size,
+                "size_mb": round(output_size / (1024 * 1024), 2),
                 "duration": output_info.get("duration", 0),
-                "size": os.path.getsize(output_path),
-                "trimmed_seconds": trimmed_seconds,
-                "command": " ".join(concat_cmd if 'concat_cmd' in locals() else cmd)
+                "width": output_info.get("width"),
+                "height": output_info.get("height"),
+                "fps": output_info.get("fps"),
+                "has_audio": output_info.get("has_audio", False),
+                "trimmed_seconds": round(sum(inpoints), 3),
+                "tracks_mixed": len(audio_tracks or []),
+                "settings_used": dict(export_settings),
+                "command": shlex.join(cmd)
             }
             
         except Exception as e:
@@ -181,6 +487,170 @@ class FFmpegWrapper:
                 "error": str(e)
             }
     
+    @staticmethod
+    def _log_concat_inputs(video_paths: List[str], input_infos: List[Dict[str, Any]]):
+        """Verify and log all input files before concatenation."""
+        print(f"[FFmpeg] Verifying {len(video_paths)} input files for concatenation", file=sys.stderr)
+        for i, (path, info) in enumerate(zip(video_paths, input_infos)):
+            if not Path(path).exists():
+                print(f"[FFmpeg] ERROR: Input file {i} does not exist: {path}", file=sys.stderr)
+            else:
+                print(f"[FFmpeg] Input {i}: {Path(path).name} - {info.get('width', 0)}x{info.get('height', 0)}, {info.get('duration', 0):.2f}s", file=sys.stderr)
+            if "h2a_end.mp4" in path:
+                print(f"[FFmpeg] Using end video without trimming: {path}", file=sys.stderr)
+    
+    def _concat_list(
+        self,
+        video_paths: List[str],
+        input_infos: List[Dict[str, Any]],
+        inpoints: List[float]
+    ) -> bytes:
+        """Build the concat demuxer script, starting each clip at its inpoint."""
+        self._log_concat_inputs(video_paths, input_infos)
+        
+        concat_lines = []
+        for path, inpoint in zip(video_paths, inpoints):
+            concat_lines.append(f"file {self._concat_quote(path)}\n")
+            if inpoint > 0:
+                concat_lines.append(f"inpoint {inpoint}\n")
+        
+        return "".join(concat_lines).encode()
+    
+    def _concat_filter_args(
+        self,
+        video_paths: List[str],
+        input_infos: List[Dict[str, Any]],
+        inpoints: List[float],
+        has_audio: bool
+    ) -> List[str]:
+        """Input, filter and codec arguments that trim and join clips whose parameters differ.
+        
+        Trimmed clips seek with -ss before their -i, so ffmpeg starts decoding at
+        the inpoint instead of decoding frames only to drop them. Every clip is scaled and
+        padded to the first clip's size and converted to its frame rate, so the
+        concat filter sees uniform segments.
+        """
+        self._log_concat_inputs(video_paths, input_infos)
+        
+        first = input_infos[0]
+        width = first.get("width") or 1920
+        height = first.get("height") or 1080
+        fps = first.get("fps") or 30
+        
+        args = []
+        for path, inpoint in zip(video_paths, inpoints):
+            if inpoint > 0:
+                args.extend(["-ss", str(inpoint)])
+            args.extend(["-i", str(path)])
+        
+        filter_parts = []
+        segments = []
+        for i in range(len(video_paths)):
+            filter_parts.append(
+                f"[{i}:v]scale={width}:{height}:force_original_aspect_ratio=decrease,"
+                f"pad={width}:{height}:(ow-iw)/2:(oh-ih)/2,setsar=1,fps={fps},format=yuv420p[v{i}]"
+            )
+            segments.append(f"[v{i}]")
+            if has_audio:
+                filter_parts.append(f"[{i}:a]aresample=48000,aformat=channel_layouts=stereo[a{i}]")
+                segments.append(f"[a{i}]")
+        
+        outputs = "[vout][aout]" if has_audio else "[vout]"
+        filter_parts.append(f"{''.join(segments)}concat=n={len(video_paths)}:v=1:a={int(has_audio)}{outputs}")
+        
+        args.extend(["-filter_complex", ";".join(filter_parts), "-map", "[vout]"])
+        if has_audio:
+            args.extend(["-map", "[aout]"])
+        args.extend(self._h264_encode_args("fast", 23))
+        args.extend(["-pix_fmt", "yuv420p"])
+        args.extend(["-c:a", "aac", "-b:a", "192k"] if has_audio else ["-an"])
+        return args
+    
+    @staticmethod
+    def _clip_inpoints(video_paths: List[str]) -> List[float]:
+        """Start offset of each clip: the first clip and end videos (h2a_end.mp4) play in full."""
+        return [
+            0.0 if i == 0 or "h2a_end.mp4" in path else CLIP_TRIM_SECONDS
+            for i, path in enumerate(video_paths)
+        ]
+    
+    async def _snap_to_keyframes(self, video_paths: List[str], inpoints: List[float]) -> List[float]:
+        """Move each inpoint forward to the clip's next keyframe, if one is near.
+        
+        With stream copy the concat demuxer can only start a clip cleanly on a
+        keyframe; an inpoint between keyframes leaves frames that cannot be
+        decoded and show as a freeze. Inpoints with no keyframe within
+        KEYFRAME_SNAP_WINDOW are left unchanged.
+        """
+        async def _snap(path: str, inpoint: float) -> float:
+            if inpoint <= 0:
+                return inpoint
+            async with self._probe_semaphore:
+                keyframe = await self._first_keyframe_after(path, inpoint, inpoint + KEYFRAME_SNAP_WINDOW)
+            if keyframe is None:
+                return inpoint
+            if keyframe != inpoint:
+                print(f"[FFmpeg] Trimming {Path(path).name} at keyframe {keyframe:.3f}s instead of {inpoint}s", file=sys.stderr)
+            return round(keyframe, 6)
+        
+        return await asyncio.gather(*[_snap(path, inpoint) for path, inpoint in zip(video_paths, inpoints)])
+    
+    async def _first_keyframe_after(self, video_path: str, start: float, end: float) -> Optional[float]:
+        """Timestamp of the first video keyframe in [start, end], or None."""
+        if av is not None:
+            try:
+                return await asyncio.to_thread(self._first_keyframe_with_pyav, str(video_path), start, end)
+            except Exception as e:
+                print(f"[FFmpeg] PyAV could not read keyframes of {video_path}, falling back to ffprobe: {e}", file=sys.stderr)
+        
+        # Packet flags are enough to spot keyframes, so nothing is decoded
+        cmd = [
+            self._get_ffprobe_command(),
+            "-v", "quiet",
+            "-select_streams", "v:0",
+            "-read_intervals", f"{start}%{end}",
+            "-show_entries", "packet=pts_time,flags",
+            "-of", "csv=p=0",
+            str(video_path)
+        ]
+        try:
+            proc = await self._spawn(cmd)
+            stdout, _ = await proc.communicate()
+        except OSError as e:
+            print(f"[FFmpeg] Could not probe keyframes of {video_path}: {e}", file=sys.stderr)
+            return None
+        if proc.returncode != 0:
+            return None
+        
+        keyframes = []
+        for line in stdout.decode().splitlines():
+            pts_time, _, flags = line.partition(",")
+            if flags.startswith("K"):
+                try:
+                    timestamp = float(pts_time)
+                except ValueError:
+                    continue
+                if start <= timestamp <= end:
+                    keyframes.append(timestamp)
+        return min(keyframes, default=None)
+    
+    @staticmethod
+    def _first_keyframe_with_pyav(video_path: str, start: float, end: float) -> Optional[float]:
+        """Demux (without decoding) up to end and return the first keyframe at or after start."""
+        with av.open(video_path) as container:
+            if not container.streams.video:
+                return None
+            stream = container.streams.video[0]
+            for packet in container.demux(stream):
+                if packet.pts is None:
+                    continue
+                timestamp = float(packet.pts * packet.time_base)
+                if timestamp > end:
+                    break
+                if packet.is_keyframe and timestamp >= start:
+                    return timestamp
+        return None
+    
     async def add_audio_track(
         self,
         video_path: str,
@@ -251,8 +721,7 @@ class FFmpegWrapper:
                     "-i", str(video_path),
                     "-i", str(audio_path),
                     "-c:v", "copy",  # Copy video stream
-                    "-c:a", "aac",   # Encode audio
-                    "-b:a", "192k",
+                    *self._audio_codec_args(audio_path, bool(audio_filters)),
                     "-map", "0:v",   # Video from first input
                     "-map", "1:a",   # Audio from second input
                     # Removed -shortest to preserve full video duration
@@ -267,7 +736,7 @@ class FFmpegWrapper:
                     cmd.insert(-1, filter_str)
             
             # Log the command for debugging
-            print(f"[FFmpeg] add_audio_track command: {' '.join(cmd)}", file=sys.stderr)
+            print(f"[FFmpeg] add_audio_track command: {shlex.join(cmd)}", file=sys.stderr)
             
             # Execute command
             result = await self._run_ffmpeg(cmd, timeout=60)
@@ -275,17 +744,20 @@ class FFmpegWrapper:
             if not result.get("success", False):
                 return result
             
-            # Verify the output has audio
+            # Verify the output has audio; it can also outlast the video if the track is longer
             output_info = await self.get_video_info(output_path)
             print(f"[FFmpeg] Output has audio: {output_info.get('has_audio', False)}", file=sys.stderr)
-            
+
+            output_size = output_info.get("size") or (await self._stat(output_path)).st_size
+
             return {
                 "success": True,
                 "output_path": output_path,
-                "size": os.path.getsize(output_path),
+                "size": output_size,
+                "duration": output_info.get("duration", 0),
                 "audio_filters": audio_filters if not has_existing_audio else new_audio_filters,
                 "mixed_audio": has_existing_audio,
-                "command": " ".join(cmd)
+                "command": shlex.join(cmd)
             }
             
         except Exception as e:
@@ -321,45 +793,9 @@ class FFmpegWrapper:
             cmd = [self.ffmpeg_path, "-i", str(video_path)]
             
             # Add all audio inputs
-            for track in audio_tracks:
-                cmd.extend(["-i", str(track["path"])])
+            cmd.extend(self._audio_input_args(audio_tracks))
             
-            # Build filter complex for mixing all audio tracks
-            filter_parts = []
-            audio_inputs = []
-            
-            # Apply volume to each audio track
-            for i, track in enumerate(audio_tracks):
-                audio_idx = i + 1  # 0 is the video
-                volume = track.get("volume", 1.0)
-                
-                if volume != 1.0:
-                    filter_parts.append(f"[{audio_idx}:a]volume={volume}[a{i}]")
-                    audio_inputs.append(f"[a{i}]")
-                else:
-                    audio_inputs.append(f"[{audio_idx}:a]")
-            
-            # Mix all audio tracks
-            if len(audio_tracks) == 1:
-                # Single track, no mixing needed
-                if filter_parts:
-                    filter_complex = ";".join(filter_parts)
-                    audio_output = audio_inputs[0]
-                else:
-                    filter_complex = None
-                    audio_output = "1:a"
-            else:
-                # Multiple tracks, mix them
-                if filter_parts:
-                    filter_complex = ";".join(filter_parts) + ";"
-                else:
-                    filter_complex = ""
-                
-                # Use amix with weights to preserve volume
-                # Use 'longest' to preserve full video duration
-                weights = " ".join(["1" for _ in audio_tracks])
-                filter_complex += f"{''.join(audio_inputs)}amix=inputs={len(audio_tracks)}:duration=longest:dropout_transition=0:weights='{weights}'[aout]"
-                audio_output = "[aout]"
+            filter_complex, audio_output = self._audio_mix_filter(audio_tracks)
             
             # Complete the command
             if filter_complex:
@@ -369,8 +805,7 @@ class FFmpegWrapper:
                 "-map", "0:v",          # Video from first input
                 "-map", audio_output,   # Mixed audio
                 "-c:v", "copy",         # Copy video stream
-                "-c:a", "aac",          # Encode audio
-                "-b:a", "192k",
+                *self._audio_codec_args(audio_tracks[0]["path"], filter_complex is not None),
                 # Removed -shortest to preserve full video duration
                 "-y",
                 str(output_path)
@@ -386,12 +821,14 @@ class FFmpegWrapper:
             if not result.get("success", False):
                 return result
             
+            output_size = (await self._stat(output_path)).st_size
+            
             return {
                 "success": True,
                 "output_path": output_path,
-                "size": os.path.getsize(output_path),
+                "size": output_size,
                 "tracks_mixed": len(audio_tracks),
-                "command": " ".join(cmd)
+                "command": shlex.join(cmd)
             }
             
         except Exception as e:
@@ -400,6 +837,47 @@ class FFmpegWrapper:
                 "error": str(e)
             }
     
+    @staticmethod
+    def _audio_input_args(audio_tracks: List[Dict[str, Any]]) -> List[str]:
+        """-i arguments for each audio track, built in one pass."""
+        return list(itertools.chain.from_iterable(("-i", str(track["path"])) for track in audio_tracks))
+    
+    @staticmethod
+    def _audio_mix_filter(audio_tracks: List[Dict[str, Any]]) -> Tuple[Optional[str], str]:
+        """Filter graph and output label that mix audio_tracks, read from inputs 1..n.
+        
+        Input 0 is always the video. Returns (None, "1:a") for a single track
+        at full volume, which needs no filtering at all.
+        """
+        filter_parts = []
+        audio_inputs = []
+        
+        # Apply volume to each audio track
+        for i, track in enumerate(audio_tracks):
+            audio_idx = i + 1  # 0 is the video
+            volume = track.get("volume", 1.0)
+            
+            if volume != 1.0:
+                filter_parts.append(f"[{audio_idx}:a]volume={volume}[a{i}]")
+                audio_inputs.append(f"[a{i}]")
+            else:
+                audio_inputs.append(f"[{audio_idx}:a]")
+        
+        # Mix all audio tracks
+        if len(audio_tracks) == 1:
+            # Single track, no mixing needed
+            if filter_parts:
+                return ";".join(filter_parts), audio_inputs[0]
+            return None, "1:a"
+        
+        # Use amix with weights to preserve volume
+        # Use 'longest' to preserve full video duration
+        weights = " ".join(["1" for _ in audio_tracks])
+        filter_parts.append(
+            f"{''.join(audio_inputs)}amix=inputs={len(audio_tracks)}:duration=longest:dropout_transition=0:weights='{weights}'[aout]"
+        )
+        return ";".join(filter_parts), "[aout]"
+    
     async def export_for_platform(
         self,
         input_path: str,
@@ -410,31 +888,7 @@ class FFmpegWrapper:
     ) -> Dict[str, Any]:
         """Export video optimized for specific platform."""
         try:
-            # Platform-specific settings
-            platform_settings = {
-                "youtube": {
-                    "codec": "copy",
-                    "preset": "slow",
-                    "crf": "18",
-                    "audio_bitrate": "384k"
-                },
-                "tiktok": {
-                    "codec": "copy",
-                    "preset": "medium",
-                    "crf": "23",
-                    "audio_bitrate": "256k",
-                    "max_size": "287M"  # TikTok limit
-                },
-                "instagram_reel": {
-                    "codec": "copy",
-                    "preset": "medium",
-                    "crf": "23",
-                    "audio_bitrate": "256k",
-                    "max_size": "100M"
-                }
-            }
-            
-            settings = platform_settings.get(platform, platform_settings["youtube"])
+            settings = self._platform_export_settings(platform)
             
             # Build command
             cmd = [
@@ -444,13 +898,8 @@ class FFmpegWrapper:
             
             # Add watermark if requested
             if include_watermark and watermark_text:
-                filter_text = f"drawtext=text='{watermark_text}':fontcolor=white:fontsize=24:x=10:y=10"
-                cmd.extend([
-                    "-vf", filter_text,
-                    "-c:v", "libx264",  # Must re-encode when adding watermark
-                    "-preset", "fast",
-                    "-crf", "23"
-                ])
+                cmd.extend(["-vf", _drawtext_filter(watermark_text)])
+                cmd.extend(self._h264_encode_args("fast", 23))  # Must re-encode when adding watermark
             else:
                 cmd.extend(["-c:v", "copy"])  # Copy when no filters
             
@@ -468,20 +917,22 @@ class FFmpegWrapper:
             cmd.append(str(output_path))
             
             # Execute command
-            result = await self._run_ffmpeg(cmd, timeout=60)
+            result = await self._run_encode(cmd, timeout=60)
             
             # Get output info
             output_info = await self.get_video_info(output_path)
             
+            output_size = output_info.get("size") or (await self._stat(output_path)).st_size
+            
             return {
                 "success": True,
                 "output_path": output_path,
                 "platform": platform,
-                "size": os.path.getsize(output_path),
-                "size_mb": round(os.path.getsize(output_path) / (1024 * 1024), 2),
+                "size": output_size,
+                "size_mb": round(output_size / (1024 * 1024), 2),
                 "duration": output_info.get("duration", 0),
-                "settings_used": settings,
-                "command": " ".join(cmd)
+                "settings_used": dict(settings),
+                "command": shlex.join(cmd)
             }
             
         except Exception as e:
@@ -490,6 +941,11 @@ class FFmpegWrapper:
                 "error": str(e)
             }
     
+    @staticmethod
+    def _platform_export_settings(platform: str) -> Dict[str, str]:
+        """Encoding settings for a platform export, defaulting to YouTube."""
+        return PLATFORM_EXPORT_SETTINGS.get(platform, PLATFORM_EXPORT_SETTINGS["youtube"])
+    
     async def add_logo_overlay(
         self,
         input_path: str,
@@ -542,9 +998,7 @@ class FFmpegWrapper:
                 "-i", str(input_path),      # Video input
                 "-i", str(logo_path),       # Logo input
                 "-filter_complex", filter_complex,
-                "-c:v", "libx264",          # Must re-encode video for overlay
-                "-preset", "fast",          # Fast encoding
-                "-crf", "23",               # Good quality
+                *self._h264_encode_args("fast", 23),  # Must re-encode video for overlay
                 "-c:a", "copy",             # Copy audio without re-encoding
                 "-movflags", "+faststart",
                 "-y",
@@ -554,7 +1008,7 @@ class FFmpegWrapper:
             print(f"[FFmpeg] Adding logo overlay at {position} with {padding}px padding", file=sys.stderr)
             
             # Execute command
-            result = await self._run_ffmpeg(cmd, timeout=120)
+            result = await self._run_encode(cmd, timeout=120)
             
             if not result.get("success", False):
                 return result
@@ -562,15 +1016,17 @@ class FFmpegWrapper:
             # Get output info
             output_info = await self.get_video_info(output_path)
             
+            output_size = output_info.get("size") or (await self._stat(output_path)).st_size
+            
             return {
                 "success": True,
                 "output_path": output_path,
-                "size": os.path.getsize(output_path),
-                "size_mb": round(os.path.getsize(output_path) / (1024 * 1024), 2),
+                "size": output_size,
+                "size_mb": round(output_size / (1024 * 1024), 2),
                 "duration": output_info.get("duration", 0),
                 "logo_position": position,
                 "logo_padding": padding,
-                "command": " ".join(cmd)
+                "command": shlex.join(cmd)
             }
             
         except Exception as e:
@@ -579,8 +1035,133 @@ class FFmpegWrapper:
                 "error": str(e)
             }
     
+    @staticmethod
+    def _audio_codec_args(audio_path: str, filtered: bool) -> List[str]:
+        """Audio codec arguments for muxing a track: copy untouched AAC, else encode to AAC."""
+        if not filtered and Path(audio_path).suffix.lower() in AAC_AUDIO_EXTENSIONS:
+            return ["-c:a", "copy"]
+        return ["-c:a", "aac", "-b:a", "192k"]
+    
+    @staticmethod
+    def _concat_quote(path: str) -> str:
+        """Quote a path as an absolute, single-quoted concat demuxer token.
+        
+        Inside single quotes the demuxer takes every character literally, so
+        backslashes (Windows paths) must stay as they are; a quote is written
+        by closing the quoted run, adding an escaped quote and reopening.
+        The explicit file: protocol stops ffmpeg from resolving the path
+        against the script's own URL (pipe:0), which would yield pipe:/path.
+        """
+        return "'file:" + str(Path(path).resolve()).replace("'", "'\\''") + "'"
+    
+    @staticmethod
+    async def _stat(path) -> os.stat_result:
+        """stat() a file in a worker thread so slow disks don't stall the event loop."""
+        return await asyncio.to_thread(os.stat, path)
+    
     async def get_video_info(self, video_path: str) -> Dict[str, Any]:
-        """Get video metadata using ffprobe."""
+        """Get video metadata (PyAV or ffprobe), reusing results for unchanged files."""
+        try:
+            file_stat = await self._stat(video_path)
+        except OSError as e:
+            return {"error": str(e)}
+        
+        key = (os.path.abspath(video_path), file_stat.st_mtime_ns, file_stat.st_size)
+        cached = self._probe_cache.get(key)
+        if cached is not None:
+            self._probe_cache.move_to_end(key)
+            return dict(cached)
+        
+        info = await self._probe_video(video_path)
+        if "error" not in info:
+            self._probe_cache[key] = info
+            if len(self._probe_cache) > self._probe_cache_size:
+                self._probe_cache.popitem(last=False)
+        return dict(info)
+    
+    @staticmethod
+    def _streams_match(infos: List[Dict[str, Any]]) -> bool:
+        """Whether all probed inputs share the parameters stream-copy concat requires."""
+        signatures = {
+            (
+                info.get("codec"),
+                info.get("width"),
+                info.get("height"),
+                info.get("fps"),
+                info.get("pix_fmt"),
+                info.get("time_base"),  # Mixed timescales make copied timestamps drift
+                info.get("audio_codec")
+            )
+            for info in infos
+        }
+        return len(signatures) == 1 and not any(info.get("error") for info in infos)
+    
+    async def streams_match(
+        self,
+        video_paths: List[str],
+        video_infos: Optional[List[Optional[Dict[str, Any]]]] = None
+    ) -> bool:
+        """Whether the clips can be joined by stream copy (see concat_videos for video_infos)."""
+        return self._streams_match(await self._known_video_infos(video_paths, video_infos))
+    
+    async def _known_video_infos(
+        self,
+        video_paths: List[str],
+        video_infos: Optional[List[Optional[Dict[str, Any]]]]
+    ) -> List[Dict[str, Any]]:
+        """Metadata for video_paths, probing only the entries video_infos leaves empty."""
+        if not video_infos:
+            return await self.get_video_info_batch(video_paths)
+        missing = [path for path, info in zip(video_paths, video_infos) if not info]
+        probed = iter(await self.get_video_info_batch(missing))
+        return [info or next(probed) for info in video_infos]
+    
+    async def get_video_info_batch(self, video_paths: List[str]) -> List[Dict[str, Any]]:
+        """Get metadata for several files, overlapping probes up to the CPU count."""
+        async def _bounded(path: str) -> Dict[str, Any]:
+            async with self._probe_semaphore:
+                return await self.get_video_info(path)
+        
+        return await asyncio.gather(*[_bounded(path) for path in video_paths])
+    
+    async def _probe_video(self, video_path: str) -> Dict[str, Any]:
+        """Extract the metadata the wrapper uses, in-process with PyAV when it is installed."""
+        if av is not None:
+            try:
+                return await asyncio.to_thread(self._probe_with_pyav, str(video_path))
+            except Exception as e:
+                print(f"[FFmpeg] PyAV could not read {video_path}, falling back to ffprobe: {e}", file=sys.stderr)
+        return await self._probe_with_ffprobe(video_path)
+    
+    @staticmethod
+    def _probe_with_pyav(video_path: str) -> Dict[str, Any]:
+        """Read container metadata with PyAV, matching the fields _probe_with_ffprobe returns."""
+        with av.open(video_path) as container:
+            video_stream = next(iter(container.streams.video), None)
+            audio_stream = next(iter(container.streams.audio), None)
+            
+            # base_rate is ffprobe's r_frame_rate
+            rate = None
+            if video_stream is not None:
+                rate = video_stream.base_rate or video_stream.average_rate
+            video_ctx = video_stream.codec_context if video_stream is not None else None
+            
+            return {
+                "duration": container.duration / av.time_base if container.duration else 0.0,
+                "size": container.size,
+                "bit_rate": container.bit_rate or 0,
+                "width": video_ctx.width if video_ctx else 0,
+                "height": video_ctx.height if video_ctx else 0,
+                "fps": round(float(rate), 2) if rate else 0,
+                "codec": video_ctx.name if video_ctx else "unknown",
+                "pix_fmt": (video_ctx.pix_fmt or "unknown") if video_ctx else "unknown",
+                "time_base": str(video_stream.time_base) if video_stream is not None and video_stream.time_base else "unknown",
+                "has_audio": audio_stream is not None,
+                "audio_codec": audio_stream.codec_context.name if audio_stream is not None else "none"
+            }
+    
+    async def _probe_with_ffprobe(self, video_path: str) -> Dict[str, Any]:
+        """Run ffprobe on a file and extract the metadata the wrapper uses."""
         try:
             # Get appropriate ffprobe command for platform
             ffprobe_cmd = self._get_ffprobe_command()
@@ -588,16 +1169,11 @@ class FFmpegWrapper:
                 ffprobe_cmd,
                 "-v", "quiet",
                 "-print_format", "json",
-                "-show_format",
-                "-show_streams",
+                "-show_entries", FFPROBE_ENTRIES,
                 str(video_path)
             ]
             
-            proc = await asyncio.create_subprocess_exec(
-                *cmd,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE
-            )
+            proc = await self._spawn(cmd)
             
             stdout, stderr = await proc.communicate()
             
@@ -608,26 +1184,20 @@ class FFmpegWrapper:
             
             # Extract key information
             format_info = data.get("format", {})
-            streams = data.get("streams", [])
             
-            video_stream = next(
-                (s for s in streams if s["codec_type"] == "video"),
-                {}
-            )
+            # Index the first stream of each type in one pass
+            first_streams = {}
+            for stream in data.get("streams", []):
+                first_streams.setdefault(stream.get("codec_type"), stream)
+            video_stream = first_streams.get("video", {})
+            audio_stream = first_streams.get("audio")
             
-            audio_stream = next(
-                (s for s in streams if s["codec_type"] == "audio"),
-                None
-            )
-            
-            # Calculate fps safely
-            fps = 0
-            if video_stream.get("r_frame_rate"):
-                try:
-                    num, den = video_stream["r_frame_rate"].split("/")
-                    fps = float(num) / float(den) if float(den) != 0 else 0
-                except:
-                    fps = 0
+            # Calculate fps safely; ffprobe reports it as an integer ratio like "30000/1001"
+            num, _, den = video_stream.get("r_frame_rate", "0/1").partition("/")
+            try:
+                fps = int(num) / int(den or 1)
+            except (ValueError, ZeroDivisionError):
+                fps = 0
             
             return {
                 "duration": float(format_info.get("duration", 0)),
@@ -637,6 +1207,8 @@ class FFmpegWrapper:
                 "height": video_stream.get("height", 0),
                 "fps": round(fps, 2),
                 "codec": video_stream.get("codec_name", "unknown"),
+                "pix_fmt": video_stream.get("pix_fmt", "unknown"),
+                "time_base": video_stream.get("time_base", "unknown"),
                 "has_audio": audio_stream is not None,
                 "audio_codec": audio_stream.get("codec_name", "none") if audio_stream else "none"
             }
@@ -644,41 +1216,111 @@ class FFmpegWrapper:
         except Exception as e:
             return {"error": str(e)}
     
-    async def _run_ffmpeg(self, cmd: List[str], timeout: int = 120) -> Dict[str, Any]:
-        """Run ffmpeg command asynchronously with timeout and progress monitoring."""
+    @staticmethod
+    async def _spawn(cmd: List[str], pipe_stdin: bool = False) -> asyncio.subprocess.Process:
+        """Start an ffmpeg/ffprobe process with captured stdout and stderr.
+        
+        Children never inherit our stdin, which carries the MCP protocol. Python's
+        own descriptors are non-inheritable (PEP 446), so close_fds=False is safe
+        and lets CPython start the child with posix_spawn() when the binary path is
+        absolute. The larger stream limit lets big ffprobe/stderr outputs be read
+        without the transport pausing every 128 KiB.
+        """
+        return await asyncio.create_subprocess_exec(
+            *cmd,
+            stdin=asyncio.subprocess.PIPE if pipe_stdin else asyncio.subprocess.DEVNULL,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            limit=SUBPROCESS_STREAM_LIMIT,
+            close_fds=False
+        )
+    
+    async def _run_ffmpeg(
+        self,
+        cmd: List[str],
+        timeout: int = 120,
+        input_bytes: Optional[bytes] = None
+    ) -> Dict[str, Any]:
+        """Run ffmpeg command asynchronously with timeout and progress monitoring.
+        
+        The last element of cmd must be the output path; a -threads cap is
+        inserted just before it. input_bytes, if given, is written to ffmpeg's
+        stdin (for inputs read from pipe:0).
+        """
+        async with self._encode_semaphore:
+            return await self._run_ffmpeg_unbounded(
+                [*cmd[:-1], "-threads", str(self._threads_per_invocation), cmd[-1]],
+                timeout,
+                input_bytes
+            )
+    
+    async def _run_ffmpeg_unbounded(
+        self,
+        cmd: List[str],
+        timeout: int,
+        input_bytes: Optional[bytes] = None
+    ) -> Dict[str, Any]:
+        """Run an ffmpeg command without acquiring a concurrency slot.
+        
+        stderr is consumed as it is written and only its last lines are kept,
+        so long encodes don't accumulate their whole log in memory.
+        """
         try:
             # Log the command being executed
             print(f"[FFmpeg] Executing: {' '.join(cmd[:3])}...", file=sys.stderr)
             
-            proc = await asyncio.create_subprocess_exec(
-                *cmd,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE
-            )
+            # Only errors reach stderr, so successful runs have next to nothing to drain
+            cmd = [cmd[0], *QUIET_ARGS, *cmd[1:]]
+            
+            proc = await self._spawn(cmd, pipe_stdin=input_bytes is not None)
+            stderr_tail: Deque[str] = deque(maxlen=STDERR_TAIL_LINES)
+            
+            async def _drain_stderr():
+                # Stats lines end in \r rather than \n, so split on both
+                pending = b""
+                while chunk := await proc.stderr.read(STDERR_READ_SIZE):
+                    *lines, pending = STDERR_LINE_BREAK.split(pending + chunk)
+                    for line in lines:
+                        if line:
+                            stderr_tail.append(line.decode(errors="replace"))
+                if pending:
+                    stderr_tail.append(pending.decode(errors="replace"))
+            
+            async def _feed_stdin():
+                try:
+                    proc.stdin.write(input_bytes)
+                    await proc.stdin.drain()
+                except (BrokenPipeError, ConnectionResetError):
+                    pass  # ffmpeg exited early; its stderr says why
+                finally:
+                    proc.stdin.close()
+            
+            io_tasks = [proc.stdout.read(), _drain_stderr()]
+            if input_bytes is not None:
+                io_tasks.append(_feed_stdin())
             
             try:
                 # Wait for process with timeout
-                stdout, stderr = await asyncio.wait_for(
-                    proc.communicate(),
-                    timeout=timeout
-                )
+                stdout, *_ = await asyncio.wait_for(asyncio.gather(*io_tasks), timeout=timeout)
+                await proc.wait()
             except asyncio.TimeoutError:
                 # Kill the process if it times out
                 proc.kill()
                 await proc.wait()
                 raise RuntimeError(f"FFmpeg timed out after {timeout} seconds")
             
+            stderr = "\n".join(stderr_tail)
+            
             if proc.returncode != 0:
-                # Include more stderr for debugging (but still limit to prevent overflow)
-                error_msg = stderr.decode()[:5000]  # Increased from 2000 to 5000
+                # Keep the end of stderr, where ffmpeg reports the failure
                 raise RuntimeError(
-                    f"FFmpeg failed with code {proc.returncode}: {error_msg}"
+                    f"FFmpeg failed with code {proc.returncode}: {stderr[-5000:]}"
                 )
             
             return {
                 "success": True,
                 "stdout": stdout.decode(),
-                "stderr": stderr.decode()
+                "stderr": stderr
             }
             
         except Exception as e:
@@ -687,13 +1329,7 @@ class FFmpegWrapper:
     
     def get_aspect_ratio_filter(self, aspect_ratio: str) -> str:
         """Get ffmpeg filter for aspect ratio adjustment."""
-        ratios = {
-            "16:9": "scale=1920:1080:force_original_aspect_ratio=decrease,pad=1920:1080:(ow-iw)/2:(oh-ih)/2",
-            "9:16": "scale=1080:1920:force_original_aspect_ratio=decrease,pad=1080:1920:(ow-iw)/2:(oh-ih)/2",
-            "1:1": "scale=1080:1080:force_original_aspect_ratio=decrease,pad=1080:1080:(ow-iw)/2:(oh-ih)/2",
-            "4:5": "scale=864:1080:force_original_aspect_ratio=decrease,pad=864:1080:(ow-iw)/2:(oh-ih)/2"
-        }
-        return ratios.get(aspect_ratio, ratios["16:9"])
+        return ASPECT_RATIO_FILTERS.get(aspect_ratio, ASPECT_RATIO_FILTERS["16:9"])
     
     def _get_ffprobe_command(self) -> str:
         """Get the appropriate ffprobe command for the current platform."""
@@ -717,5 +1353,30 @@ class FFmpegWrapper:
         return ffprobe_name
 
 
-# Singleton instance
-ffmpeg_wrapper = FFmpegWrapper()
\ No newline at end of file
+# Singleton instance, created on first use so importing the module stays cheap
+_ffmpeg_wrapper: Optional[FFmpegWrapper] = None
+
+
+_ffmpeg_wrapper_lock = asyncio.Lock()
+
+
+def get_ffmpeg_wrapper() -> FFmpegWrapper:
+    """Get or create the FFmpeg wrapper singleton.
+    
+    Creating it can run several blocking ffmpeg checks, so code on the event
+    loop must use get_ffmpeg_wrapper_async instead.
+    """
+    global _ffmpeg_wrapper
+    if _ffmpeg_wrapper is None:
+        _ffmpeg_wrapper = FFmpegWrapper()
+    return _ffmpeg_wrapper
+
+
+async def get_ffmpeg_wrapper_async() -> FFmpegWrapper:
+    """Get or create the FFmpeg wrapper singleton without blocking the event loop."""
+    global _ffmpeg_wrapper
+    if _ffmpeg_wrapper is None:
+        async with _ffmpeg_wrapper_lock:
+            if _ffmpeg_wrapper is None:
+                _ffmpeg_wrapper = await asyncio.to_thread(FFmpegWrapper)
+    return _ffmpeg_wrapper
@@ -1,16 +1,26 @@
 """Simple file upload caching service to avoid duplicate uploads."""
 
+import os
 import hashlib
+import heapq
+import mmap
+import stat
+import time
+from collections import OrderedDict
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional, Tuple
 import asyncio
-import aiofiles
-from datetime import datetime, timedelta
+import orjson
+from datetime import datetime
 
 class FileUploadCache:
     """
-    Simple LRU cache for file uploads to avoid re-uploading the same files.
+    Segmented LRU cache for file uploads to avoid re-uploading the same files.
     Caches file hash -> URL mappings.
+    
+    New entries land in a small probationary segment and are promoted to the
+    protected segment on their second hit, so a batch of one-off frames cannot
+    evict reference images (logos, character sheets) that are reused across scenes.
     """
     
     def __init__(self, max_size: int = 100, ttl_hours: int = 24):
@@ -21,10 +31,20 @@ class FileUploadCache:
             max_size: Maximum number of cached entries
             ttl_hours: Time-to-live for cache entries in hours
         """
-        self._cache: Dict[str, Dict[str, Any]] = {}  # hash -> {url, timestamp}
+        # hash -> {url, expires (epoch seconds)}, least recently used first
+        self._probation: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._protected: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
         self._max_size = max_size
-        self._ttl = timedelta(hours=ttl_hours)
-        self._lock = asyncio.Lock()
+        self._probation_size = max(1, max_size // 4)
+        self._protected_size = max_size - self._probation_size
+        self._ttl_seconds = ttl_hours * 3600
+        # (expires, hash) min-heap for sweeping; entries evicted or re-added leave stale items behind
+        self._expiry_heap: List[Tuple[float, str]] = []
+        self._dirty = False
+        self._inflight: Dict[str, asyncio.Future] = {}  # hash -> pending upload result
+        # (abs path, size, mtime_ns) -> hash, so an unchanged file is never re-hashed
+        self._stat_index: Dict[Tuple[str, int, int], str] = {}
+        self._stat_index_size = 10 * max_size
     
     async def get_or_upload(self, file_path: str, upload_func) -> Dict[str, Any]:
         """
@@ -32,58 +52,90 @@ class FileUploadCache:
         
         Args:
             file_path: Path to the file
-            upload_func: Async function to upload the file
+            upload_func: Async function called as upload_func(file_path, file_size)
             
         Returns:
             Dict with success status, URL, and cache hit info
         """
         try:
             path = Path(file_path)
-            if not path.exists():
+            
+            # Single stat() covers both the existence and regular-file checks
+            try:
+                file_stat = path.stat()
+            except FileNotFoundError:
                 return {
                     "success": False,
                     "error": f"File not found: {file_path}"
                 }
             
-            if not path.is_file():
+            if not stat.S_ISREG(file_stat.st_mode):
                 return {
                     "success": False,
                     "error": f"Path is not a file: {file_path}"
                 }
             
-            # Calculate file hash
-            file_hash = await self._calculate_file_hash(path)
+            # Calculate file hash, unless this exact file was hashed before
+            stat_key = (os.path.abspath(path), file_stat.st_size, file_stat.st_mtime_ns)
+            file_hash = self._stat_index.get(stat_key)
+            if file_hash is None:
+                file_hash = await self._calculate_file_hash(path)
+                self._stat_index[stat_key] = file_hash
+                self._dirty = True
+                if len(self._stat_index) > self._stat_index_size:
+                    # Evict the oldest entry (dicts keep insertion order)
+                    del self._stat_index[next(iter(self._stat_index))]
+            
+            # Check cache, or join an upload of the same content that is already running.
+            # Nothing between here and the upload awaits, so no lock is needed.
+            cached = self._get_cached_url(file_hash)
+            if cached:
+                return {
+                    "success": True,
+                    "url": cached,
+                    "cached": True,
+                    "original_path": file_path,
+                    "file_hash": file_hash,
+                    "size": file_stat.st_size
+                }
             
-            # Check cache
-            async with self._lock:
-                cached = self._get_cached_url(file_hash)
-                if cached:
-                    return {
-                        "success": True,
-                        "url": cached,
-                        "cached": True,
-                        "original_path": file_path,
-                        "file_hash": file_hash
-                    }
+            inflight = self._inflight.get(file_hash)
+            if inflight is None:
+                future = asyncio.get_running_loop().create_future()
+                # Mark the exception retrieved so an unshared failure isn't reported as never awaited
+                future.add_done_callback(lambda f: f.cancelled() or f.exception())
+                self._inflight[file_hash] = future
             
-            # Upload file
-            upload_result = await upload_func(file_path)
+            if inflight is not None:
+                upload_result = await asyncio.shield(inflight)
+            else:
+                try:
+                    upload_result = await upload_func(file_path, file_stat.st_size)
+                    
+                    # Cache the result before waking joiners so later callers hit the cache
+                    url = upload_result.get("url")
+                    if upload_result.get("success", False) and url:
+                        self._add_to_cache(file_hash, url)
+                    future.set_result(upload_result)
+                except asyncio.CancelledError:
+                    future.cancel()
+                    raise
+                except Exception as e:
+                    future.set_exception(e)
+                    raise
+                finally:
+                    self._inflight.pop(file_hash, None)
             
             if not upload_result.get("success", False):
                 return upload_result
             
-            # Cache the result
-            url = upload_result.get("url")
-            if url:
-                async with self._lock:
-                    await self._add_to_cache(file_hash, url)
-            
             return {
                 "success": True,
-                "url": url,
-                "cached": False,
+                "url": upload_result.get("url"),
+                "cached": inflight is not None,
                 "original_path": file_path,
-                "file_hash": file_hash
+                "file_hash": file_hash,
+                "size": file_stat.st_size
             }
             
         except Exception as e:
@@ -93,61 +145,209 @@ class FileUploadCache:
             }
     
     async def _calculate_file_hash(self, path: Path) -> str:
-        """Calculate SHA256 hash of file content asynchronously."""
-        sha256_hash = hashlib.sha256()
-        
-        async with aiofiles.open(path, 'rb') as f:
-            # Read in chunks to handle large files
-            while chunk := await f.read(8192):
-                sha256_hash.update(chunk)
+        """Calculate SHA256 hash of file content in a worker thread."""
+        return await asyncio.to_thread(self._hash_file, path)
+    
+    @staticmethod
+    def _hash_file(path: Path) -> str:
+        """Hash a file through a read-only memory map.
         
-        return sha256_hash.hexdigest()
+        The hasher reads straight from the page cache without copying into Python
+        buffers, and releases the GIL while it walks the mapping.
+        """
+        with open(path, 'rb') as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return hashlib.sha256().hexdigest()  # Empty files cannot be mapped
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                if hasattr(mm, "madvise"):
+                    mm.madvise(mmap.MADV_SEQUENTIAL)  # Ask for aggressive readahead
+                return hashlib.sha256(mm).hexdigest()
     
     def _get_cached_url(self, file_hash: str) -> Optional[str]:
         """Get URL from cache if it exists and is not expired."""
-        if file_hash not in self._cache:
+        if file_hash in self._protected:
+            segment = self._protected
+        elif file_hash in self._probation:
+            segment = self._probation
+        else:
             return None
         
-        entry = self._cache[file_hash]
-        timestamp = entry["timestamp"]
+        entry = segment[file_hash]
         
         # Check if expired
-        if datetime.now() - timestamp > self._ttl:
-            del self._cache[file_hash]
+        if entry["expires"] < time.time():
+            del segment[file_hash]
             return None
         
-        # Move to end (LRU behavior)
-        del self._cache[file_hash]
-        self._cache[file_hash] = entry
+        if segment is self._protected:
+            self._protected.move_to_end(file_hash)
+        else:
+            # Second hit: promote, demoting the protected LRU entry back to probation if full
+            del self._probation[file_hash]
+            self._protected[file_hash] = entry
+            if len(self._protected) > self._protected_size:
+                demoted_hash, demoted = self._protected.popitem(last=False)
+                self._insert_probation(demoted_hash, demoted)
         
         return entry["url"]
     
-    async def _add_to_cache(self, file_hash: str, url: str):
-        """Add URL to cache, enforcing size limit."""
-        # Remove oldest entries if at capacity
-        if len(self._cache) >= self._max_size:
-            # Remove the first (oldest) entry
-            oldest_key = next(iter(self._cache))
-            del self._cache[oldest_key]
-        
-        # Add new entry
-        self._cache[file_hash] = {
+    def _insert_probation(self, file_hash: str, entry: Dict[str, Any]):
+        """Insert at the MRU end of the probationary segment, evicting its LRU entries."""
+        self._probation[file_hash] = entry
+        self._probation.move_to_end(file_hash)
+        while len(self._probation) > self._probation_size:
+            self._probation.popitem(last=False)
+    
+    def _add_to_cache(self, file_hash: str, url: str):
+        """Add URL to cache, enforcing size limits."""
+        self._sweep()
+        entry = {
             "url": url,
-            "timestamp": datetime.now()
+            "expires": time.time() + self._ttl_seconds
         }
+        heapq.heappush(self._expiry_heap, (entry["expires"], file_hash))
+        if file_hash in self._protected:
+            self._protected[file_hash] = entry
+            self._protected.move_to_end(file_hash)
+        else:
+            self._insert_probation(file_hash, entry)
+        self._dirty = True
+    
+    def _sweep(self):
+        """Drop expired entries so they stop holding slots, oldest expiry first."""
+        now = time.time()
+        heap = self._expiry_heap
+        while heap and heap[0][0] < now:
+            expires, file_hash = heapq.heappop(heap)
+            for segment in (self._probation, self._protected):
+                entry = segment.get(file_hash)
+                # Skip stale heap items for hashes that were evicted or re-added since
+                if entry is not None and entry["expires"] == expires:
+                    del segment[file_hash]
+                    self._dirty = True
+        # Stale items pile up as entries are evicted; rebuild once they dominate
+        if len(heap) > 4 * self._max_size:
+            self._rebuild_expiry_heap()
+    
+    def _rebuild_expiry_heap(self):
+        """Recreate the expiry heap from the live entries."""
+        self._expiry_heap = [
+            (entry["expires"], file_hash)
+            for segment in (self._probation, self._protected)
+            for file_hash, entry in segment.items()
+        ]
+        heapq.heapify(self._expiry_heap)
     
     def clear(self):
         """Clear all cached entries."""
-        self._cache.clear()
+        self._probation.clear()
+        self._protected.clear()
+        self._expiry_heap.clear()
+        self._stat_index.clear()
+        self._dirty = True
+    
+    def load_from_disk(self, path: Path) -> int:
+        """
+        Load entries persisted by a previous run, dropping expired ones.
+        
+        Args:
+            path: JSON file written by save_to_disk or write_snapshot
+            
+        Returns:
+            Number of entries loaded
+        """
+        try:
+            data = orjson.loads(Path(path).read_bytes())
+        except (FileNotFoundError, orjson.JSONDecodeError):
+            return 0
+        
+        now = time.time()
+        for name, segment, limit in (
+            ("probation", self._probation, self._probation_size),
+            ("protected", self._protected, self._protected_size),
+        ):
+            for file_hash, entry in data.get(name, {}).items():
+                expires = entry.get("expires")
+                if expires is None:
+                    # Written before entries carried their expiry
+                    expires = datetime.fromisoformat(entry["timestamp"]).timestamp() + self._ttl_seconds
+                if expires >= now:
+                    segment[file_hash] = {"url": entry["url"], "expires": expires}
+            
+            # Keep the most recently used entries if the file holds more than fit
+            while len(segment) > limit:
+                segment.popitem(last=False)
+        
+        self._rebuild_expiry_heap()
+        
+        # Restore file identities so unchanged files skip hashing after a restart
+        for file_path, size, mtime_ns, file_hash in data.get("stat_index", [])[-self._stat_index_size:]:
+            self._stat_index[(file_path, size, mtime_ns)] = file_hash
+        
+        return len(self._probation) + len(self._protected)
+    
+    def snapshot(self) -> Optional[Dict[str, Any]]:
+        """
+        Copy the persisted state and mark the cache clean.
+        
+        Call this on the event loop thread; the copy can then be written from a
+        worker thread while the loop keeps using the cache.
+        
+        Returns:
+            Data for write_snapshot, or None if nothing changed since the last snapshot
+        """
+        if not self._dirty:
+            return None
+        # Only identities of still-cached content are worth keeping
+        stat_index = [
+            [*stat_key, file_hash]
+            for stat_key, file_hash in self._stat_index.items()
+            if file_hash in self._probation or file_hash in self._protected
+        ]
+        self._dirty = False
+        return {
+            "probation": dict(self._probation),
+            "protected": dict(self._protected),
+            "stat_index": stat_index
+        }
+    
+    def mark_dirty(self):
+        """Flag the cache for the next save, e.g. after a snapshot failed to write."""
+        self._dirty = True
+    
+    @staticmethod
+    def write_snapshot(path: Path, snapshot: Dict[str, Any]):
+        """Atomically write data returned by snapshot (segments in LRU order)."""
+        path = Path(path)
+        tmp_path = path.with_suffix('.tmp')
+        tmp_path.write_bytes(orjson.dumps(snapshot))
+        os.replace(tmp_path, path)
+    
+    def save_to_disk(self, path: Path):
+        """Persist both segments and the stat index if anything changed since the last save."""
+        snapshot = self.snapshot()
+        if snapshot is None:
+            return
+        try:
+            self.write_snapshot(path, snapshot)
+        except Exception:
+            self.mark_dirty()
+            raise
     
     def get_stats(self) -> Dict[str, Any]:
         """Get cache statistics."""
         return {
-            "size": len(self._cache),
+            "size": len(self._probation) + len(self._protected),
             "max_size": self._max_size,
-            "ttl_hours": self._ttl.total_seconds() / 3600,
+            "probation_size": len(self._probation),
+            "protected_size": len(self._protected),
+            "ttl_hours": self._ttl_seconds / 3600,
             "oldest_entry": min(
-                (entry["timestamp"] for entry in self._cache.values()),
+                (
+                    datetime.fromtimestamp(entry["expires"] - self._ttl_seconds)
+                    for segment in (self._probation, self._protected)
+                    for entry in segment.values()
+                ),
                 default=None
             )
         }
\ No newline at end of file
@@ -0,0 +1,131 @@
+"""Persistent registry of submitted FAL jobs so long-running generations survive restarts."""
+
+import os
+import hashlib
+import asyncio
+import aiofiles
+import orjson
+import uuid
+from pathlib import Path
+from typing import Dict, Any, Optional, List, Tuple
+from datetime import datetime, timedelta
+
+
+class JobRegistry:
+    """
+    JSON-backed registry of FAL jobs that have been submitted but not yet collected.
+    Maps a job id -> {key, model_id, request_id, run_id, submitted_at, status, result},
+    where key is the arguments hash and the job id adds a per-submission nonce.
+    
+    Jobs are only handed back to callers if an earlier process submitted them:
+    two identical calls in the same process are separate generations, each with
+    its own entry. Entries nobody collects expire after ttl_hours.
+    """
+
+    def __init__(self, path: Path, ttl_hours: int = 24):
+        """
+        Initialize the registry, loading any jobs left over from a previous run.
+
+        Args:
+            path: JSON file used to persist the registry
+            ttl_hours: How long a submitted or completed job is kept for a caller to collect
+        """
+        self._path = Path(path)
+        self._ttl = timedelta(hours=ttl_hours)
+        self._run_id = uuid.uuid4().hex  # Tells this process's jobs apart from leftovers
+        self._jobs: Dict[str, Dict[str, Any]] = self._load()
+        self._expire()
+        self._lock = asyncio.Lock()
+
+    @staticmethod
+    def make_key(model_id: str, arguments: Dict[str, Any]) -> str:
+        """Build a stable key for a model call from its canonicalized arguments."""
+        payload = orjson.dumps(
+            {"model_id": model_id, "arguments": arguments},
+            option=orjson.OPT_SORT_KEYS,
+            default=str
+        )
+        return hashlib.sha256(payload).hexdigest()
+
+    def claim(self, key: str) -> Optional[Tuple[str, Dict[str, Any]]]:
+        """
+        Take over a job left by an earlier process, so only one caller reattaches to it.
+
+        Args:
+            key: Arguments hash from make_key
+
+        Returns:
+            (job id, job), or None if no earlier process left a job for these arguments
+        """
+        for job_id, job in self._jobs.items():
+            # Entries written before job ids had nonces are keyed by the bare hash
+            if job.get("key", job_id) == key and job.get("run_id") != self._run_id:
+                job["run_id"] = self._run_id
+                return job_id, job
+        return None
+
+    def pending(self) -> List[Tuple[str, Dict[str, Any]]]:
+        """List (job id, job) for jobs from earlier processes that were submitted but have no result yet."""
+        return [
+            (key, job) for key, job in self._jobs.items()
+            if job.get("status") == "pending" and job.get("run_id") != self._run_id
+        ]
+
+    async def record(self, key: str, model_id: str, request_id: str) -> str:
+        """Record a job immediately after it has been submitted to FAL and return its job id."""
+        job_id = f"{key}:{uuid.uuid4().hex[:12]}"
+        async with self._lock:
+            self._expire()
+            self._jobs[job_id] = {
+                "key": key,
+                "model_id": model_id,
+                "request_id": request_id,
+                "run_id": self._run_id,
+                "submitted_at": datetime.now().isoformat(),
+                "status": "pending",
+                "result": None
+            }
+            await self._save()
+        return job_id
+
+    async def complete(self, job_id: str, result: Dict[str, Any]):
+        """Store the result of a resumed job until a caller collects it."""
+        async with self._lock:
+            job = self._jobs.get(job_id)
+            if job:
+                job["status"] = "completed"
+                job["completed_at"] = datetime.now().isoformat()
+                job["result"] = result
+                await self._save()
+
+    async def remove(self, job_id: Optional[str]):
+        """Forget a job once its result has been delivered or it has failed."""
+        if job_id is None:
+            return
+        async with self._lock:
+            if self._jobs.pop(job_id, None) is not None:
+                await self._save()
+
+    def _expire(self):
+        """Drop jobs submitted or completed longer than the TTL ago that nobody collected."""
+        cutoff = (datetime.now() - self._ttl).isoformat()
+        for job_id in [
+            job_id for job_id, job in self._jobs.items()
+            if (job.get("completed_at") or job.get("submitted_at") or "") < cutoff
+        ]:
+            del self._jobs[job_id]
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        """Load the registry from disk, ignoring a missing or corrupt file."""
+        try:
+            with open(self._path, 'rb') as f:
+                return orjson.loads(f.read())
+        except (FileNotFoundError, orjson.JSONDecodeError):
+            return {}
+
+    async def _save(self):
+        """Write the registry atomically so a crash never leaves a truncated file."""
+        tmp_path = self._path.with_suffix('.tmp')
+        async with aiofiles.open(tmp_path, 'wb') as f:
+            await f.write(orjson.dumps(self._jobs, default=str))
+        os.replace(tmp_path, self._path)
@@ -0,0 +1,122 @@
+"""LRU + TTL cache for results of deterministic FAL generations."""
+
+import os
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Any, Optional, Tuple
+import orjson
+
+
+class ResultCache:
+    """
+    LRU cache with per-entry expiry for generation results.
+    Caches canonical request key -> result dict.
+    """
+
+    def __init__(self, max_size: int = 256, ttl_hours: int = 24):
+        """
+        Initialize the cache.
+
+        Args:
+            max_size: Maximum number of cached results
+            ttl_hours: Time-to-live for cached results in hours
+        """
+        self._cache: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()  # key -> (expires_at, result)
+        self._max_size = max_size
+        self._ttl_seconds = ttl_hours * 3600
+        self._hits = 0
+        self._misses = 0
+        self._dirty = False
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Get a cached result if present and not expired."""
+        entry = self._cache.get(key)
+        if entry is None:
+            self._misses += 1
+            return None
+
+        expires_at, result = entry
+        if expires_at < time.time():
+            del self._cache[key]
+            self._misses += 1
+            return None
+
+        # Move to end (LRU behavior)
+        self._cache.move_to_end(key)
+        self._hits += 1
+        return result
+
+    def put(self, key: str, result: Dict[str, Any]):
+        """Store a result, evicting the least recently used entry when full."""
+        self._cache[key] = (time.time() + self._ttl_seconds, result)
+        self._cache.move_to_end(key)
+        while len(self._cache) > self._max_size:
+            self._cache.popitem(last=False)
+        self._dirty = True
+
+    def clear(self):
+        """Clear all cached results."""
+        self._cache.clear()
+        self._dirty = True
+
+    def load_from_disk(self, path: Path) -> int:
+        """Load results persisted by a previous run, dropping expired ones."""
+        try:
+            data = orjson.loads(Path(path).read_bytes())
+        except (FileNotFoundError, orjson.JSONDecodeError):
+            return 0
+
+        now = time.time()
+        for key, (expires_at, result) in data.items():
+            if expires_at >= now:
+                self._cache[key] = (expires_at, result)
+
+        while len(self._cache) > self._max_size:
+            self._cache.popitem(last=False)
+
+        return len(self._cache)
+
+    def snapshot(self) -> Optional[Dict[str, Any]]:
+        """Copy the cached results (in LRU order) and mark the cache clean.
+
+        Call this on the event loop thread; the copy can then be written from a
+        worker thread. Returns None if nothing changed since the last snapshot.
+        """
+        if not self._dirty:
+            return None
+        self._dirty = False
+        return dict(self._cache)
+
+    def mark_dirty(self):
+        """Flag the cache for the next save, e.g. after a snapshot failed to write."""
+        self._dirty = True
+
+    @staticmethod
+    def write_snapshot(path: Path, snapshot: Dict[str, Any]):
+        """Atomically write data returned by snapshot."""
+        path = Path(path)
+        tmp_path = path.with_suffix('.tmp')
+        tmp_path.write_bytes(orjson.dumps(snapshot))
+        os.replace(tmp_path, path)
+
+    def save_to_disk(self, path: Path):
+        """Persist results (in LRU order) if anything changed since the last save."""
+        snapshot = self.snapshot()
+        if snapshot is None:
+            return
+        try:
+            self.write_snapshot(path, snapshot)
+        except Exception:
+            self.mark_dirty()
+            raise
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics."""
+        return {
+            "size": len(self._cache),
+            "max_size": self._max_size,
+            "ttl_hours": self._ttl_seconds / 3600,
+            "hits": self._hits,
+            "misses": self._misses
+        }
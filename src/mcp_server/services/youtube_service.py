@@ -1,20 +1,28 @@
 """YouTube API service for fetching video categories, searching videos, and uploading videos."""
 
 import os
+import asyncio
 import random
+import threading
 import time
 import json
 import http.client
+from operator import itemgetter
 import httplib2
-from typing import Dict, Any, List, Optional, Tuple
+from collections import defaultdict
+from typing import Callable, Dict, Any, List, Optional, Tuple
 from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
-from googleapiclient.http import MediaFileUpload
+from googleapiclient.http import MediaFileUpload, build_http
 from google_auth_oauthlib.flow import InstalledAppFlow
+from google.auth.exceptions import RefreshError
 from google.auth.transport.requests import Request
+from google_auth_httplib2 import AuthorizedHttp
 from google.oauth2.credentials import Credentials
-from dataclasses import dataclass
+from dataclasses import asdict, dataclass
 import logging
+from ..config import settings
+from .ffmpeg_wrapper import get_ffmpeg_wrapper_async
 
 logger = logging.getLogger(__name__)
 
@@ -26,13 +34,73 @@ RETRIABLE_EXCEPTIONS = (httplib2.HttpLib2Error, IOError, http.client.NotConnecte
                         http.client.CannotSendRequest, http.client.CannotSendHeader,
                         http.client.ResponseNotReady, http.client.BadStatusLine)
 RETRIABLE_STATUS_CODES = [500, 502, 503, 504]
+# Videos are streamed from disk in chunks of this size (a multiple of 256 KiB, as the API requires)
+UPLOAD_CHUNK_SIZE = 8 * 1024 * 1024
+# YouTube's per-video upload limits
+MAX_UPLOAD_BYTES = 128 * 1024 ** 3
+MAX_UPLOAD_DURATION = 12 * 3600  # seconds
+# Uploads running at once; YouTube throttles per channel, so more only compete for bandwidth
+MAX_CONCURRENT_UPLOADS = 3
+
+# Data API (search, details, categories) retry settings; 429 is retried there as well
+API_MAX_RETRIES = 5
+API_RETRIABLE_STATUS_CODES = RETRIABLE_STATUS_CODES + [429]
 
 # OAuth 2.0 settings
 CLIENT_SECRETS_FILE = "client_secrets.json"
 SCOPES = ['https://www.googleapis.com/auth/youtube.upload']
 VALID_PRIVACY_STATUSES = ("public", "private", "unlisted")
 
-@dataclass
+# Data API list endpoints accept at most this many comma-separated IDs
+MAX_IDS_PER_REQUEST = 50
+
+# How long an invalid region/language stays cached as a failure, in seconds
+CATEGORY_ERROR_TTL = 60
+
+# Thumbnail sizes to use, largest first
+THUMBNAIL_PRIORITY = ("maxres", "standard", "high", "medium", "default")
+
+
+def _retry_delay(retry: int, error: Optional[HttpError] = None) -> float:
+    """Seconds to wait before retry number `retry`.
+    
+    Honors a Retry-After header when the server sent one, otherwise uses
+    exponential backoff with full jitter.
+    """
+    if error is not None:
+        retry_after = error.resp.get("retry-after")
+        if retry_after:
+            try:
+                return float(retry_after)
+            except ValueError:
+                pass  # HTTP-date form; fall back to backoff
+    return random.random() * 2 ** retry
+
+
+class _RateLimiter:
+    """Spaces request starts at least 1/max_qps seconds apart.
+    
+    Runs on the event loop only, so the slot bookkeeping needs no lock.
+    """
+    
+    def __init__(self, max_qps: float):
+        self._interval = 1.0 / max_qps if max_qps > 0 else 0.0
+        self._next_slot = 0.0
+    
+    async def acquire(self):
+        """Wait for the next free request slot and claim it."""
+        now = time.monotonic()
+        slot = max(now, self._next_slot)
+        self._next_slot = slot + self._interval
+        if slot > now:
+            await asyncio.sleep(slot - now)
+    
+    def defer(self, seconds: float):
+        """Hold back every caller for `seconds`, e.g. after the API answers 429."""
+        self._next_slot = max(self._next_slot, time.monotonic() + seconds)
+
+
+@dataclass(slots=True, frozen=True)
 class YouTubeVideo:
     """Represents a YouTube video with metadata."""
     video_id: str
@@ -46,7 +114,7 @@ class YouTubeVideo:
     like_count: Optional[int] = None
     comment_count: Optional[int] = None
     thumbnail_url: Optional[str] = None
-    tags: List[str] = None
+    tags: Optional[List[str]] = None
 
 
 class YouTubeService:
@@ -61,8 +129,87 @@ class YouTubeService:
         # Only build the service if we have an API key (for search functionality)
         self.youtube = None
         if self.api_key:
-            self.youtube = build("youtube", "v3", developerKey=self.api_key)
-        self._categories_cache: Dict[str, List[Dict[str, Any]]] = {}
+            self.youtube = build("youtube", "v3", developerKey=self.api_key, cache_discovery=False, static_discovery=True)
+        # "region_hl" -> {"ts": fetched at (epoch seconds), "data": categories}, persisted across restarts
+        self._categories_cache_path = settings.cache_dir / "youtube_categories.json"
+        # httplib2 connections are not thread-safe, so each worker thread gets its own
+        self._thread_local = threading.local()
+        # Client-side throttle so concurrent tool calls don't burst into 403/429 quota errors
+        self._limiter = _RateLimiter(settings.youtube_max_qps)
+        # OAuth credentials and the service built on them, reused across uploads
+        self._credentials: Optional[Credentials] = None
+        self._upload_service = None
+        self._upload_semaphore = asyncio.Semaphore(MAX_CONCURRENT_UPLOADS)
+        self._categories_cache: Dict[str, Dict[str, Any]] = self._load_categories_cache()
+        # "region_hl" -> {"error": failed response, "expires": epoch seconds}; memory only
+        self._categories_errors: Dict[str, Dict[str, Any]] = {}
+        # One fetch per key at a time; concurrent misses wait and read what it cached
+        self._categories_locks: Dict[str, asyncio.Lock] = defaultdict(asyncio.Lock)
+    
+    def _load_categories_cache(self) -> Dict[str, Dict[str, Any]]:
+        """Load category lists saved by a previous run, dropping expired ones.
+        
+        A cache written by another server version is ignored.
+        """
+        try:
+            saved = json.loads(self._categories_cache_path.read_text())
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(saved, dict) or saved.get("version") != settings.version:
+            return {}
+        
+        now = time.time()
+        return {
+            key: entry
+            for key, entry in saved.get("entries", {}).items()
+            if now - entry.get("ts", 0) < settings.youtube_category_ttl
+        }
+    
+    def _save_categories_cache(self):
+        """Write the categories cache to disk atomically."""
+        try:
+            tmp_path = self._categories_cache_path.with_suffix('.tmp')
+            tmp_path.write_text(json.dumps({"version": settings.version, "entries": self._categories_cache}))
+            os.replace(tmp_path, self._categories_cache_path)
+        except OSError as e:
+            logger.warning(f"Could not save YouTube categories cache: {e}")
+    
+    def _thread_http(self) -> httplib2.Http:
+        """The calling thread's HTTP connection, created on first use and kept open."""
+        http = getattr(self._thread_local, "http", None)
+        if http is None:
+            http = self._thread_local.http = build_http()
+        return http
+    
+    async def _execute(self, request) -> Dict[str, Any]:
+        """Execute an API-key request in a worker thread so the event loop keeps running.
+        
+        Every attempt first waits for a slot from the rate limiter. 5xx, 429
+        and connection errors are retried with backoff up to API_MAX_RETRIES
+        times before the error is raised to the caller.
+        """
+        retry = 0
+        while True:
+            await self._limiter.acquire()
+            try:
+                return await asyncio.to_thread(lambda: request.execute(http=self._thread_http()))
+            except HttpError as e:
+                if e.resp.status not in API_RETRIABLE_STATUS_CODES or retry >= API_MAX_RETRIES:
+                    raise
+                error = f"HTTP {e.resp.status}"
+                delay = _retry_delay(retry + 1, e)
+                if e.resp.status == 429:
+                    # Rate limited: slow down every pending request, not just this one
+                    self._limiter.defer(delay)
+            except RETRIABLE_EXCEPTIONS as e:
+                if retry >= API_MAX_RETRIES:
+                    raise
+                error = str(e) or type(e).__name__
+                delay = _retry_delay(retry + 1)
+            
+            retry += 1
+            logger.warning(f"Retriable YouTube API error ({error}); retry {retry}/{API_MAX_RETRIES} in {delay:.2f}s")
+            await asyncio.sleep(delay)
     
     async def get_video_categories(
         self, 
@@ -81,17 +228,39 @@ class YouTubeService:
         """
         cache_key = f"{region_code}_{hl}"
         
-        # Check cache first
-        if cache_key in self._categories_cache:
+        # Check cache first, then again under the lock in case another call just filled it
+        cached = self._cached_categories(cache_key, region_code, hl)
+        if cached:
+            return cached
+        async with self._categories_locks[cache_key]:
+            cached = self._cached_categories(cache_key, region_code, hl)
+            if cached:
+                return cached
+            return await self._fetch_video_categories(cache_key, region_code, hl)
+    
+    def _cached_categories(self, cache_key: str, region_code: str, hl: str) -> Optional[Dict[str, Any]]:
+        """Return the cached response for a key, or None if it has to be fetched."""
+        now = time.time()
+        entry = self._categories_cache.get(cache_key)
+        if entry and now - entry["ts"] < settings.youtube_category_ttl:
             logger.info(f"Returning cached categories for {cache_key}")
             return {
                 "success": True,
                 "region_code": region_code,
                 "language": hl,
-                "categories": self._categories_cache[cache_key],
+                "categories": entry["data"],
                 "from_cache": True
             }
         
+        failure = self._categories_errors.get(cache_key)
+        if failure:
+            if now < failure["expires"]:
+                return failure["error"]
+            del self._categories_errors[cache_key]
+        return None
+    
+    async def _fetch_video_categories(self, cache_key: str, region_code: str, hl: str) -> Dict[str, Any]:
+        """Fetch categories from the API and cache the outcome."""
         try:
             # Check if API key is available
             if not self.youtube:
@@ -106,24 +275,25 @@ class YouTubeService:
                 regionCode=region_code,
                 hl=hl
             )
-            response = request.execute()
+            response = await self._execute(request)
             
             # Process categories
-            categories = []
-            for item in response.get("items", []):
-                category = {
+            categories = [
+                {
                     "id": item["id"],
                     "title": item["snippet"]["title"],
                     "channel_id": item["snippet"]["channelId"],
                     "assignable": item["snippet"].get("assignable", True)
                 }
-                categories.append(category)
+                for item in response.get("items", [])
+            ]
             
             # Sort by title for consistency
-            categories.sort(key=lambda x: x["title"])
+            categories.sort(key=itemgetter("title"))
             
             # Cache the results
-            self._categories_cache[cache_key] = categories
+            self._categories_cache[cache_key] = {"ts": time.time(), "data": categories}
+            self._save_categories_cache()
             
             return {
                 "success": True,
@@ -144,11 +314,18 @@ class YouTubeService:
             elif e.resp.status == 404:
                 error_message = f"No categories found for region: {region_code}"
             
-            return {
+            result = {
                 "success": False,
                 "error": error_message,
                 "error_code": e.resp.status
             }
+            if e.resp.status == 404:
+                # Remember briefly so repeated lookups of a bad region don't each hit the API
+                self._categories_errors[cache_key] = {
+                    "error": result,
+                    "expires": time.time() + CATEGORY_ERROR_TTL
+                }
+            return result
             
         except Exception as e:
             error_message = f"Unexpected error: {str(e)}"
@@ -159,8 +336,10 @@ class YouTubeService:
             }
     
     def clear_cache(self):
-        """Clear the categories cache."""
+        """Clear the categories cache, including its copy on disk."""
         self._categories_cache.clear()
+        self._categories_errors.clear()
+        self._categories_cache_path.unlink(missing_ok=True)
         logger.info("YouTube categories cache cleared")
     
     async def search_videos(
@@ -224,7 +403,7 @@ class YouTubeService:
             if next_page_token:
                 search_params["pageToken"] = next_page_token
             
-            search_response = self.youtube.search().list(**search_params).execute()
+            search_response = await self._execute(self.youtube.search().list(**search_params))
             
             video_ids = [item["id"]["videoId"] for item in search_response.get("items", [])]
             
@@ -325,13 +504,13 @@ class YouTubeService:
             if category_id:
                 params["videoCategoryId"] = category_id
             
-            response = self.youtube.videos().list(**params).execute()
+            response = await self._execute(self.youtube.videos().list(**params))
             
             videos = []
             for item in response.get("items", []):
                 video = self._parse_video_response(item)
                 if video:
-                    videos.append(video)
+                    videos.append(asdict(video))
             
             return {
                 "success": True,
@@ -373,16 +552,32 @@ class YouTubeService:
             if not self.youtube:
                 raise ValueError("YouTube API key not configured")
             
-            videos_response = self.youtube.videos().list(
-                part="snippet,contentDetails,statistics",
-                id=",".join(video_ids)
-            ).execute()
+            # videos.list takes at most 50 IDs per request; fetch the chunks concurrently
+            chunks = [
+                video_ids[i:i + MAX_IDS_PER_REQUEST]
+                for i in range(0, len(video_ids), MAX_IDS_PER_REQUEST)
+            ]
+            responses = await asyncio.gather(*[
+                self._execute(self.youtube.videos().list(
+                    part="snippet,contentDetails,statistics",
+                    id=",".join(chunk)
+                ))
+                for chunk in chunks
+            ])
+            
+            items_by_id = {
+                item["id"]: item
+                for response in responses
+                for item in response.get("items", [])
+            }
             
+            # Return videos in the order they were requested
             videos = []
-            for item in videos_response.get("items", []):
-                video = self._parse_video_response(item)
+            for video_id in video_ids:
+                item = items_by_id.get(video_id)
+                video = self._parse_video_response(item) if item else None
                 if video:
-                    videos.append(video)
+                    videos.append(asdict(video))
             
             return videos
             
@@ -391,14 +586,14 @@ class YouTubeService:
             logger.error(f"YouTube API error in _get_video_details: {error_details.get('message', str(e))}")
             raise
     
-    def _parse_video_response(self, item: Dict[str, Any]) -> Optional[Dict[str, Any]]:
-        """Parse YouTube API response into video dictionary.
+    def _parse_video_response(self, item: Dict[str, Any]) -> Optional[YouTubeVideo]:
+        """Parse YouTube API response into a video record.
         
         Args:
             item: Single video item from YouTube API response
             
         Returns:
-            Video dictionary or None if parsing fails
+            YouTubeVideo or None if parsing fails
         """
         try:
             snippet = item.get("snippet", {})
@@ -406,28 +601,26 @@ class YouTubeService:
             content_details = item.get("contentDetails", {})
             
             thumbnails = snippet.get("thumbnails", {})
-            thumbnail_url = None
-            if "maxres" in thumbnails:
-                thumbnail_url = thumbnails["maxres"]["url"]
-            elif "high" in thumbnails:
-                thumbnail_url = thumbnails["high"]["url"]
-            elif "medium" in thumbnails:
-                thumbnail_url = thumbnails["medium"]["url"]
+            thumbnail_url = next(
+                (thumbnails[size]["url"] for size in THUMBNAIL_PRIORITY if size in thumbnails),
+                None
+            )
             
-            return {
-                "video_id": item["id"],
-                "title": snippet.get("title", ""),
-                "description": snippet.get("description", ""),
-                "channel_id": snippet.get("channelId", ""),
-                "channel_title": snippet.get("channelTitle", ""),
-                "published_at": snippet.get("publishedAt", ""),
-                "duration": content_details.get("duration"),
-                "view_count": int(statistics.get("viewCount", 0)),
-                "like_count": int(statistics.get("likeCount", 0)),
-                "comment_count": int(statistics.get("commentCount", 0)),
-                "thumbnail_url": thumbnail_url,
-                "tags": snippet.get("tags", [])
-            }
+            return YouTubeVideo(
+                video_id=item["id"],
+                title=snippet.get("title", ""),
+                description=snippet.get("description", ""),
+                channel_id=snippet.get("channelId", ""),
+                channel_title=snippet.get("channelTitle", ""),
+                published_at=snippet.get("publishedAt", ""),
+                duration=content_details.get("duration"),
+                # Counts can be missing or empty (hidden likes, disabled comments, live streams)
+                view_count=int(statistics.get("viewCount") or 0),
+                like_count=int(statistics.get("likeCount") or 0),
+                comment_count=int(statistics.get("commentCount") or 0),
+                thumbnail_url=thumbnail_url,
+                tags=snippet.get("tags", [])
+            )
         except Exception as e:
             logger.error(f"Error parsing video response: {str(e)}")
             return None
@@ -435,20 +628,30 @@ class YouTubeService:
     def get_authenticated_service_for_upload(self) -> Any:
         """Get authenticated YouTube service for upload operations.
         
+        Credentials are read from token.json once and the service is built once;
+        later calls reuse both (and the service's open connection), refreshing
+        the token in place when it expires.
+        
         Returns:
             Authenticated YouTube API service object
         """
-        credentials = None
+        credentials = self._credentials
         token_path = 'token.json'
         
-        if os.path.exists(token_path):
+        if credentials is None and os.path.exists(token_path):
             credentials = Credentials.from_authorized_user_file(token_path, SCOPES)
         
         # Check if credentials are invalid or do not exist
         if not credentials or not credentials.valid:
             # If the credentials are invalid, refresh them
             if credentials and credentials.expired and credentials.refresh_token:
-                credentials.refresh(Request())
+                try:
+                    credentials.refresh(Request())
+                except RefreshError:
+                    # Revoked or otherwise unusable; start from token.json next time
+                    self._credentials = None
+                    self._upload_service = None
+                    raise
             else:
                 if not os.path.exists(CLIENT_SECRETS_FILE):
                     raise FileNotFoundError(f"Client secrets file '{CLIENT_SECRETS_FILE}' not found")
@@ -457,11 +660,17 @@ class YouTubeService:
                     CLIENT_SECRETS_FILE, SCOPES)
                 credentials = flow.run_local_server(port=0)
             
-            # Save the credentials for the next run
-            with open(token_path, 'w') as token:
+            # Save the credentials for the next run, atomically and readable only by us
+            tmp_path = token_path + '.tmp'
+            fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, 'w') as token:
                 token.write(credentials.to_json())
+            os.replace(tmp_path, token_path)
         
-        return build('youtube', 'v3', credentials=credentials)
+        if self._upload_service is None or credentials is not self._credentials:
+            self._upload_service = build('youtube', 'v3', credentials=credentials, cache_discovery=False, static_discovery=True)
+            self._credentials = credentials
+        return self._upload_service
     
     async def upload_video(
         self,
@@ -471,10 +680,14 @@ class YouTubeService:
         tags: Optional[List[str]] = None,
         category_id: str = "22",
         privacy_status: str = "private",
-        notify_subscribers: bool = True
+        notify_subscribers: bool = True,
+        progress_cb: Optional[Callable[[float], None]] = None
     ) -> Dict[str, Any]:
         """Upload a video to YouTube.
         
+        The upload runs in a worker thread, so the event loop stays responsive
+        for its whole duration; at most MAX_CONCURRENT_UPLOADS run at once.
+        
         Args:
             file_path: Path to the video file
             title: Video title
@@ -483,6 +696,7 @@ class YouTubeService:
             category_id: YouTube category ID (default: 22 - People & Blogs)
             privacy_status: Privacy status (public, private, unlisted)
             notify_subscribers: Whether to notify channel subscribers
+            progress_cb: Called on the event loop with the fraction uploaded (0.0-1.0) after each chunk
             
         Returns:
             Dictionary with upload result
@@ -493,14 +707,31 @@ class YouTubeService:
                 "error": f"Invalid privacy status. Must be one of: {', '.join(VALID_PRIVACY_STATUSES)}"
             }
         
-        if not os.path.exists(file_path):
+        try:
+            file_size = os.stat(file_path).st_size
+        except FileNotFoundError:
             return {
                 "success": False,
                 "error": f"Video file not found: {file_path}"
             }
         
+        # Reject files YouTube would refuse before opening an upload session
+        if file_size > MAX_UPLOAD_BYTES:
+            return {
+                "success": False,
+                "error": f"Video is {file_size / 1024 ** 3:.1f} GB; YouTube accepts at most 128 GB"
+            }
+        ffmpeg_wrapper = await get_ffmpeg_wrapper_async()
+        video_info = await ffmpeg_wrapper.get_video_info(file_path)
+        if video_info.get("duration", 0) > MAX_UPLOAD_DURATION:
+            return {
+                "success": False,
+                "error": f"Video is {video_info['duration'] / 3600:.1f} hours long; YouTube accepts at most 12 hours"
+            }
+        
         try:
-            youtube = self.get_authenticated_service_for_upload()
+            # May refresh the token or run the OAuth flow, both blocking
+            youtube = await asyncio.to_thread(self.get_authenticated_service_for_upload)
             
             body = {
                 "snippet": {
@@ -517,7 +748,7 @@ class YouTubeService:
             }
             
             # Create media upload object
-            media = MediaFileUpload(file_path, chunksize=-1, resumable=True)
+            media = MediaFileUpload(file_path, chunksize=UPLOAD_CHUNK_SIZE, resumable=True)
             
             # Create the insert request
             insert_request = youtube.videos().insert(
@@ -526,8 +757,14 @@ class YouTubeService:
                 media_body=media
             )
             
-            # Execute the upload
-            response = self._resumable_upload(insert_request)
+            # Execute the upload on its own connection; httplib2 connections are not thread-safe
+            http = AuthorizedHttp(self._credentials, http=build_http())
+            on_progress = None
+            if progress_cb is not None:
+                loop = asyncio.get_running_loop()
+                on_progress = lambda fraction: loop.call_soon_threadsafe(progress_cb, fraction)
+            async with self._upload_semaphore:
+                response = await asyncio.to_thread(self._resumable_upload, insert_request, http, on_progress)
             
             if response and 'id' in response:
                 video_url = f"https://www.youtube.com/watch?v={response['id']}"
@@ -568,23 +805,35 @@ class YouTubeService:
                 "error": error_message
             }
     
-    def _resumable_upload(self, request) -> Optional[Dict[str, Any]]:
-        """Handle resumable upload with retry logic.
+    def _resumable_upload(
+        self,
+        request,
+        http: Optional[httplib2.Http] = None,
+        progress_cb: Optional[Callable[[float], None]] = None
+    ) -> Optional[Dict[str, Any]]:
+        """Handle resumable upload with retry logic. Blocks; run it in a worker thread.
         
         Args:
             request: YouTube API upload request
+            http: Authorized connection to send the chunks on (defaults to the request's own)
+            progress_cb: Called with the fraction uploaded after each chunk
             
         Returns:
             Response dict or None if failed
         """
         response = None
         error = None
+        http_error = None
         retry = 0
         
+        logger.info("Uploading video...")
         while response is None:
             try:
-                logger.info("Uploading video...")
-                status, response = request.next_chunk()
+                status, response = request.next_chunk(http=http)
+                if status is not None:
+                    logger.info(f"Upload progress: {int(status.progress() * 100)}%")
+                    if progress_cb is not None:
+                        progress_cb(status.progress())
                 
                 if response is not None:
                     if 'id' in response:
@@ -597,6 +846,7 @@ class YouTubeService:
             except HttpError as e:
                 if e.resp.status in RETRIABLE_STATUS_CODES:
                     error = f"Retriable HTTP error {e.resp.status}: {e.content}"
+                    http_error = e
                 else:
                     raise
                     
@@ -611,11 +861,11 @@ class YouTubeService:
                     logger.error("Max retries exceeded")
                     return None
                 
-                max_sleep = 2 ** retry
-                sleep_seconds = random.random() * max_sleep
+                sleep_seconds = _retry_delay(retry, http_error)
                 logger.info(f"Sleeping {sleep_seconds:.2f} seconds before retry...")
                 time.sleep(sleep_seconds)
                 error = None
+                http_error = None
         
         return response
     
@@ -639,10 +889,10 @@ class YouTubeService:
                 }
             
             # First, get the video details to extract channel ID
-            video_response = self.youtube.videos().list(
+            video_response = await self._execute(self.youtube.videos().list(
                 part="snippet",
                 id=video_id
-            ).execute()
+            ))
             
             items = video_response.get("items", [])
             if not items:
@@ -654,10 +904,10 @@ class YouTubeService:
             channel_id = items[0]["snippet"]["channelId"]
             
             # Now get the channel details
-            channel_response = self.youtube.channels().list(
+            channel_response = await self._execute(self.youtube.channels().list(
                 part="snippet,contentDetails,statistics",
                 id=channel_id
-            ).execute()
+            ))
             
             channel_items = channel_response.get("items", [])
             if not channel_items:
@@ -1,8 +1,9 @@
 """Add audio track tool implementation."""
 
+import os
 from typing import Dict, Any
 from pathlib import Path
-from ...services import ffmpeg_wrapper
+from ...services import get_ffmpeg_wrapper_async
 from ...config import settings
 from ...utils import (
     create_error_response,
@@ -57,17 +58,18 @@ async def add_audio_track(
             )
         
         # Check files exist
-        video_file = Path(video_path)
-        audio_file = Path(audio_path)
-        
-        if not video_file.exists():
+        try:
+            os.stat(video_path)
+        except FileNotFoundError:
             return handle_file_operation_error(
                 FileNotFoundError(f"Video file not found: {video_path}"),
                 video_path,
                 "reading video file"
             )
         
-        if not audio_file.exists():
+        try:
+            os.stat(audio_path)
+        except FileNotFoundError:
             return handle_file_operation_error(
                 FileNotFoundError(f"Audio file not found: {audio_path}"),
                 audio_path,
@@ -120,6 +122,7 @@ async def add_audio_track(
         output_path = video_file.parent / output_filename
         
         # Add audio track
+        ffmpeg_wrapper = await get_ffmpeg_wrapper_async()
         result = await ffmpeg_wrapper.add_audio_track(
             video_path=video_path,
             audio_path=audio_path,
@@ -132,15 +135,12 @@ async def add_audio_track(
         if not result["success"]:
             return result
         
-        # Get output info
-        output_info = await ffmpeg_wrapper.get_video_info(str(output_path))
-        
         return {
             "success": True,
             "output": {
                 "path": str(output_path),
                 "size_mb": round(result["size"] / (1024 * 1024), 2),
-                "duration": output_info.get("duration", 0)
+                "duration": result.get("duration", 0)
             },
             "audio_settings": {
                 "track_type": track_type,
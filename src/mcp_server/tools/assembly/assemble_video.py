@@ -6,7 +6,7 @@ import sys
 from pathlib import Path
 from ...models import ProjectManager, ProjectStatus
 from ...config import settings
-from ...services import asset_storage, ffmpeg_wrapper
+from ...services import asset_storage, get_ffmpeg_wrapper_async
 
 
 async def assemble_video(
@@ -36,6 +36,7 @@ async def assemble_video(
     """
     
     try:
+        ffmpeg_wrapper = await get_ffmpeg_wrapper_async()
         print(f"[AssembleVideo] Starting assembly for project {project_id}", file=sys.stderr)
         project = ProjectManager.get_project(project_id)
         
@@ -54,7 +55,7 @@ async def assemble_video(
                         "path": str(existing_video),
                         "format": output_format,
                         "duration": video_info.get("duration", 0),
-                        "size_mb": round(existing_video.stat().st_size / (1024 * 1024), 2),
+                        "size_mb": round((video_info.get("size") or existing_video.stat().st_size) / (1024 * 1024), 2),
                         "already_assembled": True
                     },
                     "message": "Video was already assembled with audio tracks. No need to call add_audio_track!",
@@ -101,14 +102,16 @@ async def assemble_video(
         output_filename = f"{project.title.replace(' ', '_')}_{project.platform}.{output_format}"
         output_path = settings.get_project_dir(project_id) / output_filename
         
-        # Collect video paths
+        # Collect video paths, with the metadata probed when each was downloaded
         video_paths = []
+        video_infos = []
         
         for scene in scenes:
             # Get video asset
             video_asset = next((a for a in scene.assets if a.type == "video"), None)
             if video_asset and video_asset.local_path:
                 video_paths.append(video_asset.local_path)
+                video_infos.append(video_asset.probe)
                 print(f"[AssembleVideo] Added video: {video_asset.local_path}", file=sys.stderr)
         
         # Add end video if requested
@@ -124,6 +127,7 @@ async def assemble_video(
                     print(f"[AssembleVideo] Continuing without end video", file=sys.stderr)
                 else:
                     video_paths.append(str(end_video_path))
+                    video_infos.append(end_video_info)
                     print(f"[AssembleVideo] Added end video: {end_video_path}", file=sys.stderr)
                     print(f"[AssembleVideo] End video duration: {end_video_info.get('duration', 0):.2f}s", file=sys.stderr)
                     print(f"[AssembleVideo] End video resolution: {end_video_info.get('width', 0)}x{end_video_info.get('height', 0)}", file=sys.stderr)
@@ -131,108 +135,73 @@ async def assemble_video(
                 print(f"[AssembleVideo] WARNING: End video not found at {end_video_path}", file=sys.stderr)
                 print(f"[AssembleVideo] Continuing without end video", file=sys.stderr)
         
-        # Use ffmpeg_wrapper to concatenate videos
-        print(f"[AssembleVideo] Concatenating {len(video_paths)} videos...", file=sys.stderr)
-        concat_result = await ffmpeg_wrapper.concat_videos(
-            video_paths=video_paths,
-            output_path=str(output_path),
-            quality_preset=quality_preset
-        )
-        print(f"[AssembleVideo] Concatenation complete", file=sys.stderr)
+        # Prepare audio tracks info
+        audio_tracks_info = []
+        for audio_track in project.global_audio_tracks:
+            if audio_track.local_path:
+                track_info = {
+                    "path": audio_track.local_path,
+                    "type": "voiceover" if audio_track.type == "speech" else "music",
+                    "volume": 1.0 if audio_track.type == "speech" else 0.3
+                }
+                audio_tracks_info.append(track_info)
+                print(f"[AssembleVideo] - {track_info['type']}: volume={track_info['volume']}", file=sys.stderr)
         
-        # Check if concatenated video has audio
-        concat_info = await ffmpeg_wrapper.get_video_info(str(output_path))
-        print(f"[AssembleVideo] Concatenated video has audio: {concat_info.get('has_audio', False)}", file=sys.stderr)
+        # Clips that can be stream-copied are joined and mixed with the audio tracks in
+        # one ffmpeg run; anything else goes through concat_videos' re-encoding path
+        # and a separate mixing pass. Neither applies platform export limits.
+        fused = settings.fused_assembly and await ffmpeg_wrapper.streams_match(video_paths, video_infos)
+        if fused:
+            print(f"[AssembleVideo] Concatenating {len(video_paths)} videos with {len(audio_tracks_info)} audio track(s) in one pass...", file=sys.stderr)
+            concat_result = await ffmpeg_wrapper.concat_and_export(
+                video_paths=video_paths,
+                output_path=str(output_path),
+                audio_tracks=audio_tracks_info or None,
+                video_infos=video_infos
+            )
+        else:
+            print(f"[AssembleVideo] Concatenating {len(video_paths)} videos...", file=sys.stderr)
+            concat_result = await ffmpeg_wrapper.concat_videos(
+                video_paths=video_paths,
+                output_path=str(output_path),
+                quality_preset=quality_preset,
+                video_infos=video_infos
+            )
+        print(f"[AssembleVideo] Concatenation complete", file=sys.stderr)
         
         if not concat_result["success"]:
             return {
                 "success": False,
                 "error": f"Failed to assemble video: {concat_result['error']}"
             }
+        print(f"[AssembleVideo] Concatenated video has audio: {concat_result.get('has_audio', False)}", file=sys.stderr)
+        # Set once a later pass rewrites output_path, so the concat probe no longer applies
+        output_rewritten = False
         
-        # Check if we have global audio tracks to add
-        if project.global_audio_tracks:
-            print(f"[AssembleVideo] Found {len(project.global_audio_tracks)} audio tracks to add", file=sys.stderr)
+        # Mix global audio tracks, unless the fused run already did
+        if audio_tracks_info and not fused:
+            # One FFmpeg pass mixes every track and copies the video stream,
+            # however many tracks there are
+            import time
+            timestamp = int(time.time())
+            temp_output = settings.get_project_dir(project_id) / f".temp_audio_mixed_{timestamp}.{output_format}"
+            temp_files_created.append(temp_output)
+            print(f"[AssembleVideo] Mixing {len(audio_tracks_info)} audio track(s) in one pass", file=sys.stderr)
             
-            # Prepare audio tracks info
-            audio_tracks_info = []
-            for audio_track in project.global_audio_tracks:
-                if audio_track.local_path:
-                    track_info = {
-                        "path": audio_track.local_path,
-                        "type": "voiceover" if audio_track.type == "speech" else "music",
-                        "volume": 1.0 if audio_track.type == "speech" else 0.3
-                    }
-                    audio_tracks_info.append(track_info)
-                    print(f"[AssembleVideo] - {track_info['type']}: volume={track_info['volume']}", file=sys.stderr)
+            audio_result = await ffmpeg_wrapper.add_multiple_audio_tracks(
+                video_path=str(output_path),
+                audio_tracks=audio_tracks_info,
+                output_path=str(temp_output)
+            )
             
-            if len(audio_tracks_info) > 1:
-                # Use the new method to mix all tracks at once
-                # Create unique temp filename to avoid conflicts
-                import time
-                timestamp = int(time.time())
-                temp_output = settings.get_project_dir(project_id) / f".temp_audio_mixed_{timestamp}.{output_format}"
-                temp_files_created.append(temp_output)
-                print(f"[AssembleVideo] Mixing {len(audio_tracks_info)} audio tracks in one pass", file=sys.stderr)
-                
-                audio_result = await ffmpeg_wrapper.add_multiple_audio_tracks(
-                    video_path=str(output_path),
-                    audio_tracks=audio_tracks_info,
-                    output_path=str(temp_output)
-                )
-                
-                if audio_result["success"]:
-                    print(f"[AssembleVideo] Successfully mixed all audio tracks", file=sys.stderr)
-                    # Replace original with audio version atomically
-                    backup_path = output_path.with_suffix('.backup')
-                    try:
-                        Path(output_path).rename(backup_path)  # Backup original
-                        Path(temp_output).rename(output_path)  # Move new file
-                        backup_path.unlink()  # Delete backup
-                        temp_files_created.remove(temp_output)  # No longer a temp file
-                    except Exception as e:
-                        print(f"[AssembleVideo] Error replacing file: {e}", file=sys.stderr)
-                        # Restore backup if something went wrong
-                        if backup_path.exists():
-                            backup_path.rename(output_path)
-                else:
-                    print(f"[AssembleVideo] Failed to mix audio tracks: {audio_result.get('error', 'Unknown error')}", file=sys.stderr)
-                    # Fall back to sequential adding
-                    await _add_audio_tracks_sequentially(
-                        ffmpeg_wrapper, output_path, audio_tracks_info, 
-                        output_format, project_id, settings
-                    )
-            elif len(audio_tracks_info) == 1:
-                # Single track, use simple add
-                import time
-                timestamp = int(time.time())
-                temp_output = settings.get_project_dir(project_id) / f".temp_audio_single_{timestamp}.{output_format}"
-                temp_files_created.append(temp_output)
-                track = audio_tracks_info[0]
-                
-                print(f"[AssembleVideo] Adding single {track['type']} track", file=sys.stderr)
-                audio_result = await ffmpeg_wrapper.add_audio_track(
-                    video_path=str(output_path),
-                    audio_path=track["path"],
-                    output_path=str(temp_output),
-                    audio_volume=track["volume"]
-                )
-                
-                if audio_result["success"]:
-                    print(f"[AssembleVideo] Successfully added {track['type']} track", file=sys.stderr)
-                    # Replace original with audio version atomically
-                    backup_path = output_path.with_suffix('.backup')
-                    try:
-                        Path(output_path).rename(backup_path)  # Backup original
-                        Path(temp_output).rename(output_path)  # Move new file
-                        backup_path.unlink()  # Delete backup
-                        temp_files_created.remove(temp_output)  # No longer a temp file
-                    except Exception as e:
-                        print(f"[AssembleVideo] Error replacing file: {e}", file=sys.stderr)
-                        if backup_path.exists():
-                            backup_path.rename(output_path)
-                else:
-                    print(f"[AssembleVideo] Failed to add {track['type']} track: {audio_result.get('error', 'Unknown error')}", file=sys.stderr)
+            if audio_result["success"]:
+                print(f"[AssembleVideo] Successfully mixed all audio tracks", file=sys.stderr)
+                # Atomic on the same filesystem; the original stays intact if this fails
+                os.replace(temp_output, output_path)
+                temp_files_created.remove(temp_output)  # No longer a temp file
+                output_rewritten = True
+            else:
+                print(f"[AssembleVideo] Failed to mix audio tracks: {audio_result.get('error', 'Unknown error')}", file=sys.stderr)
         
         # Add logo overlay if requested
         if add_logo:
@@ -277,6 +246,7 @@ async def assemble_video(
                     try:
                         Path(output_path).rename(backup_path)  # Backup original
                         Path(temp_logo_output).rename(output_path)  # Move new file
+                        output_rewritten = True
                         backup_path.unlink()  # Delete backup
                         temp_files_created.remove(temp_logo_output)  # No longer a temp file
                     except Exception as e:
@@ -312,9 +282,12 @@ async def assemble_video(
         total_duration = sum(scene.duration for scene in scenes)
         total_size_estimate = total_duration * 5  # MB estimate
         
-        # Get actual file info
-        video_info = await ffmpeg_wrapper.get_video_info(str(output_path))
-        actual_size_mb = round(os.path.getsize(output_path) / (1024 * 1024), 2)
+        # The concat probe only describes the file if nothing rewrote it since; mixed
+        # audio can run past the video and change the duration
+        video_info = concat_result
+        if output_rewritten or not video_info.get("width"):
+            video_info = await ffmpeg_wrapper.get_video_info(str(output_path))
+        actual_size_mb = round((video_info.get("size") or os.path.getsize(output_path)) / (1024 * 1024), 2)
         
         # List all video files in project directory for debugging
         video_files = list(project_dir.glob(f"*.{output_format}"))
@@ -339,6 +312,7 @@ async def assemble_video(
                 "audio_tracks_added": len(project.global_audio_tracks),
                 "dynamic_transitions": True,
                 "seconds_trimmed": concat_result.get("trimmed_seconds", 0),
+                "single_pass_assembly": fused,
                 "logo_added": add_logo,
                 "logo_position": logo_position if add_logo else None,
                 "logo_padding": logo_padding if add_logo else None,
@@ -363,54 +337,3 @@ async def assemble_video(
             "success": False,
             "error": str(e)
         }
-    
-async def _add_audio_tracks_sequentially(
-    ffmpeg_wrapper, output_path, audio_tracks_info, 
-    output_format, project_id, settings
-):
-        """Fallback method to add audio tracks one by one."""
-        current_output = str(output_path)
-        temp_files_to_clean = []
-        
-        for i, track in enumerate(audio_tracks_info):
-            import time
-            timestamp = int(time.time())
-            temp_output = settings.get_project_dir(project_id) / f".temp_audio_seq_{i}_{timestamp}.{output_format}"
-            temp_files_to_clean.append(temp_output)
-            
-            print(f"[AssembleVideo] Adding {track['type']} track {i+1}/{len(audio_tracks_info)} (fallback)", file=sys.stderr)
-            audio_result = await ffmpeg_wrapper.add_audio_track(
-                video_path=current_output,
-                audio_path=track["path"],
-                output_path=str(temp_output),
-                audio_volume=track["volume"]
-            )
-            
-            if audio_result["success"]:
-                print(f"[AssembleVideo] Successfully added {track['type']} track", file=sys.stderr)
-                # Clean up previous temp file if not the original
-                if current_output != str(output_path) and Path(current_output) in temp_files_to_clean:
-                    try:
-                        Path(current_output).unlink(missing_ok=True)
-                        temp_files_to_clean.remove(Path(current_output))
-                    except:
-                        pass
-                current_output = str(temp_output)
-            else:
-                print(f"[AssembleVideo] Failed to add {track['type']} track: {audio_result.get('error', 'Unknown error')}", file=sys.stderr)
-        
-        # Move final output to correct location
-        if current_output != str(output_path):
-            Path(current_output).rename(output_path)
-            if Path(current_output) in temp_files_to_clean:
-                temp_files_to_clean.remove(Path(current_output))
-        
-        # Clean up any remaining temp files
-        for temp_file in temp_files_to_clean:
-            try:
-                if temp_file.exists():
-                    temp_file.unlink()
-            except:
-                pass
-
-
@@ -2,7 +2,7 @@
 
 from typing import Dict, Any, Optional
 import asyncio
-from ...services import fal_service, asset_storage
+from ...services import fal_service, asset_storage, get_ffmpeg_wrapper_async
 from ...models import ProjectManager, Asset, AssetType, AssetSource
 from ...config import calculate_video_cost, settings
 from ...utils import (
@@ -239,9 +239,7 @@ async def generate_video_from_image(
             # Extract the actual result from queue response
             queue_result = result.get("result", {})
             # Convert to expected format
-            video_url = None
-            if isinstance(queue_result, dict):
-                video_url = queue_result.get("video", {}).get("url") or queue_result.get("url") or queue_result.get("output_url")
+            video_url = fal_service.extract_video_url(model_config["fal_model_id"], queue_result)
             
             if not video_url:
                 return create_error_response(
@@ -339,14 +337,13 @@ async def generate_video_from_image(
                     )
                 # Update scene duration if needed
                 if scene.duration != duration:
-                    scene.duration = duration
+                    project.set_scene_duration(scene, duration)
                 
                 scene.assets.append(asset)
                 
                 # Define scene update function
                 async def update_scene():
-                    project.total_cost = project.calculate_cost()
-                    project.actual_duration = project.calculate_duration()
+                    project.add_asset_cost(asset.cost)
                     project.updated_at = asset.created_at
                     return {"success": True}
                 
@@ -362,6 +359,11 @@ async def generate_video_from_image(
                 download_result = parallel_results.get("download", {})
                 if download_result.get("success"):
                     asset.local_path = download_result["local_path"]
+                    # Probe once now so assembly can reuse it instead of probing again
+                    ffmpeg_wrapper = await get_ffmpeg_wrapper_async()
+                    probe = await ffmpeg_wrapper.get_video_info(asset.local_path)
+                    if "error" not in probe:
+                        asset.probe = probe
         
         return {
             "success": True,
@@ -68,9 +68,9 @@ async def upload_image_file(file_path: str) -> Dict[str, Any]:
                 example="Ensure the file exists and you have read permissions"
             )
         
-        # Get file info
+        # Get file info (the upload cache already stat()ed the file)
         path = Path(file_path)
-        file_size = path.stat().st_size
+        file_size = result.get("size") or path.stat().st_size
         
         return {
             "success": True,
@@ -4,11 +4,12 @@
 import asyncio
 import sys
 from pathlib import Path
-from src.mcp_server.services.ffmpeg_wrapper import ffmpeg_wrapper
+from src.mcp_server.services.ffmpeg_wrapper import get_ffmpeg_wrapper
 from src.mcp_server.config import settings
 
 async def test_audio_duration_fix():
     """Test that videos maintain their full duration when audio is added."""
+    ffmpeg_wrapper = get_ffmpeg_wrapper()
     
     print("Testing audio duration fix...")
     print("=" * 50)
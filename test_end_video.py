@@ -3,11 +3,12 @@
 
 import asyncio
 from pathlib import Path
-from src.mcp_server.services.ffmpeg_wrapper import ffmpeg_wrapper
+from src.mcp_server.services.ffmpeg_wrapper import get_ffmpeg_wrapper
 from src.mcp_server.config import settings
 
 async def test_end_video():
     """Test that the end video file exists and is valid."""
+    ffmpeg_wrapper = get_ffmpeg_wrapper()
     
     print("Testing end video functionality...")
     